@@ -1,17 +1,41 @@
+import atexit
+import hashlib
 import io
+import json
+import os
+import pickle
 import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
 
-from dfs_core import ContestData, formalize_name, normalize_positions, normalize_team_abbreviation
+from dfs_core import ContestData, cache_path, formalize_name, normalize_positions, normalize_team_abbreviation
+from name_matching import match_player_names
+from season_data import load_game_logs
+
+STAT_COLUMNS = ["MIN", "GP", "PTS", "TRB", "AST", "STL", "BLK", "TOV"]
+STATS_CACHE_MAX_AGE = 60 * 60
+DVP_ENSEMBLE_SOURCES = ["hashtag", "basketballmonster", "local"]
+DVP_SOURCE_TIMEOUT = 45.0
+
+DVP_STAT_COLUMNS = {
+    "PTS": "p%",
+    "TRB": "r%",
+    "AST": "a%",
+    "STL": "s%",
+    "BLK": "b%",
+    "TOV": "to%",
+}
+LOCAL_DVP_LOG_COLUMNS = ["Player", "OPP_TEAM", "GAME_DATE", "GAME_URL", "MIN", "DNP"] + list(DVP_STAT_COLUMNS)
 
 
 def find_first_yahoo_contest() -> str | None:
+    import requests
+    from bs4 import BeautifulSoup
+
     url = "https://sports.yahoo.com/dailyfantasy/nba"
     response = requests.get(url, timeout=20)
     response.raise_for_status()
@@ -90,18 +114,92 @@ def import_contest_data(contest_data: ContestData) -> pd.DataFrame:
         contest_data.player_teams[player_name] = team
         contest_data.player_positions[player_name] = positions
 
+        player_id = player.get("ID")
+        if player_id is not None and pd.notna(player_id):
+            contest_data.player_ids[player_name] = str(player_id)
+
     return players
 
 
 def get_recent_player_stats(contest_data: ContestData, days: int = 15) -> pd.DataFrame:
+    return join_contest_data(fetch_fantasypros_averages(days), contest_data)
+
+
+def get_blended_player_stats(
+    contest_data: ContestData,
+    windows: list[int],
+    weights: list[float] | None = None,
+) -> pd.DataFrame:
+    return join_contest_data(fetch_blended_fantasypros_averages(windows, weights=weights), contest_data)
+
+
+def fetch_blended_fantasypros_averages(windows: list[int], weights: list[float] | None = None) -> pd.DataFrame:
+    weights = weights or [1.0] * len(windows)
+    if len(weights) != len(windows):
+        raise ValueError("Provide one weight per stats window.")
+    if len(windows) == 1:
+        return fetch_fantasypros_averages(windows[0])
+
+    with ThreadPoolExecutor(max_workers=len(windows)) as executor:
+        window_stats = list(executor.map(fetch_fantasypros_averages, windows))
+
+    # One keyed outer join across windows, then a weighted average that renormalizes the
+    # weights for players missing from some windows.
+    joined = pd.concat(
+        [frame.drop_duplicates(subset=["Player"]).set_index("Player")[STAT_COLUMNS] for frame in window_stats],
+        axis=1,
+        keys=windows,
+        join="outer",
+    )
+    weight_by_window = pd.Series(weights, index=windows, dtype=float)
+
+    blended = pd.DataFrame(index=joined.index)
+    stats_teams = [frame.set_index("Player")["StatsTeam"] for frame in window_stats if "StatsTeam" in frame.columns]
+    if stats_teams:
+        blended["StatsTeam"] = pd.concat(stats_teams).dropna().groupby(level=0).first()
+    for column in STAT_COLUMNS:
+        values = joined.xs(column, axis=1, level=1)
+        if column == "GP":
+            blended[column] = values.max(axis=1)
+            continue
+        present_weights = values.notna().mul(weight_by_window, axis=1)
+        blended[column] = values.fillna(0.0).mul(weight_by_window, axis=1).sum(axis=1) / present_weights.sum(axis=1)
+
+    return blended.round(2).reset_index()
+
+
+def fetch_fantasypros_averages(days: int, max_age_seconds: int = STATS_CACHE_MAX_AGE) -> pd.DataFrame:
+    path = cache_path("fantasypros", f"avg-overall-{days}.csv")
+    if os.path.exists(path) and time.time() - os.path.getmtime(path) < max_age_seconds:
+        return pd.read_csv(path)
+
     stats_url = f"https://www.fantasypros.com/nba/stats/avg-overall.php?days={days}"
     recent_stats = pd.read_html(stats_url)[0]
 
+    # FantasyPros lists players as "Name (TEAM - POS)"; the team helps resolve name mismatches.
+    recent_stats["StatsTeam"] = recent_stats["Player"].str.extract(r"\(\s*([A-Za-z]+)\s*-", expand=False)
+    recent_stats["StatsTeam"] = recent_stats["StatsTeam"].map(normalize_team_abbreviation, na_action="ignore")
     recent_stats["Player"] = recent_stats["Player"].str.split("(").str[0].str.strip()
     recent_stats["Player"] = recent_stats["Player"].apply(formalize_name)
+    recent_stats = recent_stats.rename(columns={"REB": "TRB", "TO": "TOV"})
+    for column in STAT_COLUMNS:
+        recent_stats[column] = pd.to_numeric(recent_stats[column], errors="coerce").fillna(0)
+
+    recent_stats.to_csv(path, index=False)
+    return recent_stats
+
+
+def join_contest_data(recent_stats: pd.DataFrame, contest_data: ContestData) -> pd.DataFrame:
+    recent_stats = recent_stats.copy()
+    recent_stats["Player"] = match_player_names(
+        recent_stats["Player"],
+        recent_stats.get("StatsTeam"),
+        contest_data.player_teams,
+    )
     recent_stats["Tm"] = recent_stats["Player"].map(contest_data.player_teams)
     recent_stats["Positions"] = recent_stats["Player"].map(contest_data.player_positions)
     recent_stats["Salary"] = recent_stats["Player"].map(contest_data.salaries)
+    recent_stats["ID"] = recent_stats["Player"].map(contest_data.player_ids)
     recent_stats["Injured"] = recent_stats["Player"].map(contest_data.inactive_players)
     recent_stats["Opponent"] = recent_stats["Tm"].map(contest_data.team_opponents)
 
@@ -109,10 +207,8 @@ def get_recent_player_stats(contest_data: ContestData, days: int = 15) -> pd.Dat
     recent_stats = recent_stats[recent_stats["Opponent"].notnull()]
     recent_stats = recent_stats[pd.to_numeric(recent_stats["Salary"], errors="coerce").notnull()]
     recent_stats = recent_stats.drop(columns=["Injured"])
-    recent_stats = recent_stats.rename(columns={"REB": "TRB", "TO": "TOV"})
 
-    stat_columns = ["MIN", "GP", "PTS", "TRB", "AST", "STL", "BLK", "TOV"]
-    for column in stat_columns:
+    for column in STAT_COLUMNS:
         recent_stats[column] = pd.to_numeric(recent_stats[column], errors="coerce").fillna(0)
 
     recent_stats["Positions"] = recent_stats["Positions"].apply(normalize_positions)
@@ -122,12 +218,32 @@ def get_recent_player_stats(contest_data: ContestData, days: int = 15) -> pd.Dat
     return recent_stats
 
 
-def get_dvp_by_position(source: str, driver=None) -> dict[str, pd.DataFrame]:
+def get_dvp_by_position(
+    source: str,
+    driver=None,
+    game_logs_path: str | None = None,
+    player_positions: dict | None = None,
+    window_days: int | None = None,
+    sources: list[str] | None = None,
+    timeout: float | dict[str, float] = DVP_SOURCE_TIMEOUT,
+) -> dict[str, pd.DataFrame]:
     source_key = source.lower()
     if source_key == "none":
         return {}
+    if source_key == "ensemble":
+        return get_ensemble_dvp(
+            sources or DVP_ENSEMBLE_SOURCES,
+            timeout=timeout,
+            game_logs_path=game_logs_path,
+            player_positions=player_positions,
+            window_days=window_days,
+        )
     if source_key == "hashtag":
         return get_hashtag_dvp()
+    if source_key == "local":
+        if not game_logs_path:
+            raise ValueError("Local DVP requires a game log file.")
+        return load_local_dvp_builder(game_logs_path, player_positions or {}).table(window_days=window_days)
     if source_key == "basketballmonster":
         if driver is None:
             raise ValueError("Basketball Monster DVP requires a Selenium driver.")
@@ -135,7 +251,294 @@ def get_dvp_by_position(source: str, driver=None) -> dict[str, pd.DataFrame]:
     raise ValueError(f"Unsupported DVP source: {source}")
 
 
+def get_ensemble_dvp(
+    sources: list[str],
+    timeout: float | dict[str, float] = DVP_SOURCE_TIMEOUT,
+    game_logs_path: str | None = None,
+    player_positions: dict | None = None,
+    window_days: int | None = None,
+) -> dict[str, pd.DataFrame]:
+    sources = validate_dvp_sources(sources)
+    started = time.monotonic()
+    abandoned = {source: threading.Event() for source in sources}
+    futures = {
+        source: _run_in_daemon_thread(
+            _fetch_dvp_source,
+            source,
+            game_logs_path,
+            player_positions,
+            window_days,
+            abandoned[source],
+        )
+        for source in sources
+    }
+
+    tables = {}
+    for source, future in futures.items():
+        source_timeout = timeout.get(source, DVP_SOURCE_TIMEOUT) if isinstance(timeout, dict) else timeout
+        try:
+            tables[source] = future.result(timeout=max(0.0, started + source_timeout - time.monotonic()))
+        except FutureTimeoutError:
+            # The thread cannot be stopped, but quitting its browser ends the page load it is stuck on.
+            abandoned[source].set()
+            _quit_drivers([driver for driver, event in list(_open_drivers.items()) if event.is_set()])
+            print(f"Skipped DVP source {source}: no response within {source_timeout:g}s")
+        except Exception as exc:
+            print(f"Skipped DVP source {source}: {exc}")
+
+    return average_dvp_tables([table for table in tables.values() if table])
+
+
+def validate_dvp_sources(sources: list[str]) -> list[str]:
+    sources = [source.strip() for source in sources if source.strip()]
+    unknown = [source for source in sources if source not in DVP_ENSEMBLE_SOURCES]
+    if unknown or not sources:
+        raise ValueError(
+            f"Unsupported ensemble DVP sources: {', '.join(unknown) or 'none given'}; "
+            f"choose from {', '.join(DVP_ENSEMBLE_SOURCES)}"
+        )
+    return list(dict.fromkeys(sources))
+
+
+def average_dvp_tables(tables: list[dict[str, pd.DataFrame]]) -> dict[str, pd.DataFrame]:
+    if not tables:
+        return {}
+
+    # Align every source on (position, team, stat) and average whichever sources cover each cell.
+    stat_columns = list(DVP_STAT_COLUMNS.values())
+    long_tables = []
+    for table in tables:
+        for position, frame in table.items():
+            columns = [column for column in stat_columns if column in frame.columns]
+            values = frame[columns].apply(
+                lambda column: pd.to_numeric(column.astype(str).str.replace("%", "", regex=False), errors="coerce")
+            )
+            values.index = values.index.map(normalize_team_abbreviation)
+            long_table = values.stack().rename("value").rename_axis(["Team", "Stat"]).reset_index()
+            long_tables.append(long_table.assign(Position=position))
+
+    combined = pd.concat(long_tables, ignore_index=True).dropna(subset=["Team", "value"])
+    averaged = combined.groupby(["Position", "Team", "Stat"])["value"].mean().round(1)
+
+    dvp_data = {}
+    for position, frame in averaged.groupby(level="Position"):
+        output = frame.droplevel("Position").unstack("Stat")
+        output = output[[column for column in stat_columns if column in output.columns]]
+        output.index.name = None
+        output.columns.name = None
+        dvp_data[position] = output.apply(lambda column: column.map(_format_percent))
+
+    return dvp_data
+
+
+def _fetch_dvp_source(
+    source: str,
+    game_logs_path: str | None,
+    player_positions: dict | None,
+    window_days: int | None,
+    abandoned: threading.Event,
+) -> dict[str, pd.DataFrame]:
+    if source != "basketballmonster":
+        return get_dvp_by_position(
+            source,
+            game_logs_path=game_logs_path,
+            player_positions=player_positions,
+            window_days=window_days,
+        )
+
+    driver = headless_chrome()
+    with _open_drivers_lock:
+        _open_drivers[driver] = abandoned
+    try:
+        if abandoned.is_set():
+            raise TimeoutError("DVP source timed out before the browser started")
+        return get_basketballmonster_dvp(driver)
+    finally:
+        _quit_drivers([driver])
+
+
+def _quit_drivers(drivers: list) -> None:
+    with _open_drivers_lock:
+        drivers = [driver for driver in drivers if _open_drivers.pop(driver, None) is not None]
+    for driver in drivers:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+
+_open_drivers: dict[object, threading.Event] = {}
+_open_drivers_lock = threading.Lock()
+atexit.register(lambda: _quit_drivers(list(_open_drivers)))
+
+
+def _run_in_daemon_thread(function, *args) -> Future:
+    # A plain daemon thread, unlike an executor worker, cannot hold up interpreter exit when a
+    # source never answers.
+    future = Future()
+
+    def run():
+        try:
+            future.set_result(function(*args))
+        except Exception as exc:
+            future.set_exception(exc)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+
+def headless_chrome():
+    from selenium import webdriver
+
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless")
+    return webdriver.Chrome(options=options)
+
+
+def get_local_dvp(
+    game_logs: pd.DataFrame,
+    player_positions: dict,
+    window_days: int | None = None,
+) -> dict[str, pd.DataFrame]:
+    builder = LocalDvpBuilder(player_positions)
+    builder.add_game_logs(game_logs)
+    return builder.table(window_days=window_days)
+
+
+def load_local_dvp_builder(game_logs_path: str, player_positions: dict) -> "LocalDvpBuilder":
+    path_key = hashlib.sha256(os.path.abspath(game_logs_path).encode("utf-8")).hexdigest()[:16]
+    state_path = cache_path("local_dvp", f"{path_key}.pkl")
+
+    builder = LocalDvpBuilder.load(state_path, player_positions)
+    builder.add_game_logs(load_game_logs(game_logs_path, columns=LOCAL_DVP_LOG_COLUMNS))
+    builder.save(state_path)
+    return builder
+
+
+class LocalDvpBuilder:
+    """Keeps per-game (opponent, position) totals so new game logs are aggregated only once."""
+
+    group_columns = ["GAME_URL", "GAME_DATE", "OPP_TEAM", "Position"]
+
+    def __init__(self, player_positions: dict):
+        self.primary_positions = _primary_positions(player_positions)
+        self.game_totals = pd.DataFrame(columns=self.group_columns + list(DVP_STAT_COLUMNS))
+        self.seen_games: set[str] = set()
+        self.unpositioned_players: set[str] = set()
+
+    @classmethod
+    def load(cls, path: str, player_positions: dict) -> "LocalDvpBuilder":
+        builder = None
+        if os.path.exists(path):
+            try:
+                with open(path, "rb") as handle:
+                    builder = pickle.load(handle)
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+                builder = None
+
+        # Saved totals are only reusable if no already-aggregated player changed position and no
+        # player skipped for lack of a position has gained one since.
+        primary_positions = _primary_positions(player_positions)
+        if not isinstance(builder, cls):
+            return cls(player_positions)
+        moved = any(primary_positions.get(name, old) != old for name, old in builder.primary_positions.items())
+        if moved or builder.unpositioned_players & set(primary_positions):
+            return cls(player_positions)
+
+        builder.primary_positions = primary_positions
+        return builder
+
+    def save(self, path: str) -> None:
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "wb") as handle:
+            pickle.dump(self, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, path)
+
+    def add_game_logs(self, game_logs: pd.DataFrame) -> int:
+        new_logs = game_logs[~game_logs["GAME_URL"].astype(str).isin(self.seen_games)]
+        new_games = set(new_logs["GAME_URL"].dropna().astype(str))
+        if "DNP" in new_logs.columns:
+            new_logs = new_logs[~new_logs["DNP"].astype(bool)]
+        new_logs = new_logs[new_logs["MIN"] > 0]
+        self.seen_games.update(new_games)
+        if new_logs.empty:
+            return 0
+
+        log_positions = {
+            name: self.primary_positions.get(formalize_name(name)) for name in new_logs["Player"].astype(str).unique()
+        }
+        self.unpositioned_players.update(
+            formalize_name(name) for name, position in log_positions.items() if position is None
+        )
+        new_logs = new_logs.assign(
+            Position=new_logs["Player"].astype(str).map(log_positions),
+            OPP_TEAM=new_logs["OPP_TEAM"].astype(str).map(normalize_team_abbreviation),
+            GAME_URL=new_logs["GAME_URL"].astype(str),
+        ).dropna(subset=["Position"])
+
+        totals = new_logs.groupby(self.group_columns, observed=True)[list(DVP_STAT_COLUMNS)].sum().reset_index()
+        frames = [frame for frame in [self.game_totals, totals] if not frame.empty]
+        if frames:
+            self.game_totals = pd.concat(frames, ignore_index=True)
+        return len(new_games)
+
+    def table(self, window_days: int | None = None, as_of=None) -> dict[str, pd.DataFrame]:
+        game_totals = self.game_totals
+        if game_totals.empty:
+            return {}
+
+        if window_days:
+            as_of = pd.Timestamp(as_of) if as_of is not None else game_totals["GAME_DATE"].max()
+            game_totals = game_totals[game_totals["GAME_DATE"] > as_of - pd.Timedelta(days=window_days)]
+
+        stat_columns = list(DVP_STAT_COLUMNS)
+        allowed = game_totals.groupby(["Position", "OPP_TEAM"])[stat_columns].mean()
+        league = allowed.groupby(level="Position").transform("mean")
+        deltas = ((allowed / league.where(league != 0)) - 1.0) * 100.0
+
+        dvp_data = {}
+        for position, frame in deltas.groupby(level="Position"):
+            output = frame.droplevel("Position").rename(columns=DVP_STAT_COLUMNS)
+            output.index.name = None
+            dvp_data[position] = output.round(1).apply(lambda column: column.map(_format_percent))
+
+        return dvp_data
+
+
+def _primary_positions(player_positions: dict) -> dict[str, str]:
+    return {
+        name: normalize_positions(positions)[0]
+        for name, positions in player_positions.items()
+        if normalize_positions(positions)
+    }
+
+
+def remember_player_positions(contest_data: ContestData) -> dict:
+    path = cache_path("player_positions.json")
+    known_positions = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as handle:
+            known_positions = json.load(handle)
+
+    known_positions.update(
+        {name: positions for name, positions in contest_data.player_positions.items() if positions}
+    )
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(known_positions, handle)
+
+    return known_positions
+
+
+def _format_percent(value) -> str | None:
+    if pd.isna(value):
+        return None
+    return f"{value:+.1f}%"
+
+
 def get_hashtag_dvp() -> dict[str, pd.DataFrame]:
+    import requests
+    from bs4 import BeautifulSoup
+
     url = "https://hashtagbasketball.com/nba-defense-vs-position"
     response = requests.get(url, timeout=20)
     response.raise_for_status()
@@ -257,6 +660,10 @@ def _parse_hashtag_dvp_from_text(page_text: str) -> dict[str, pd.DataFrame]:
 
 
 def get_basketballmonster_dvp(driver) -> dict[str, pd.DataFrame]:
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
     dvp_data = {}
     url = "https://basketballmonster.com/easerankings.aspx"
     position_options = {"3": "C", "4": "PG", "5": "SG", "6": "SF", "7": "PF"}
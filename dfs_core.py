@@ -1,10 +1,15 @@
+import os
 from dataclasses import dataclass, field
 
+CACHE_DIR = os.environ.get("DFS_CACHE_DIR", ".cache")
+
 TEAM_NAME_CORRECTIONS = {
     "NY": "NYK",
     "GS": "GSW",
     "NO": "NOP",
     "SA": "SAS",
+    "BRK": "BKN",
+    "PHO": "PHX",
     "CHA": "CHO",
     "NOR": "NOP",
 }
@@ -28,6 +33,13 @@ class ContestData:
     salaries: dict = field(default_factory=dict)
     player_teams: dict = field(default_factory=dict)
     player_positions: dict = field(default_factory=dict)
+    player_ids: dict = field(default_factory=dict)
+
+
+def cache_path(*parts: str) -> str:
+    path = os.path.join(CACHE_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
 
 
 def normalize_team_abbreviation(team: str | None) -> str | None:
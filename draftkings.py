@@ -1,13 +1,227 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-
-import sqlite3
+import argparse
 import getpass
+import hashlib
+import json
 import os
+import threading
+import time
+
+import pandas as pd
+
+from dfs_core import cache_path
 
 DB_PATH = "credentials.db"
 
+LOBBY_URL = "https://www.draftkings.com/lobby/getcontests?sport=NBA"
+DRAFTABLES_URL = "https://api.draftkings.com/draftgroups/v1/draftgroups/{draft_group_id}/draftables"
+CLASSIC_CONTEST_TYPE_ID = 70
+RESPONSE_CACHE_MAX_AGE = 15 * 60
+SALARY_COLUMNS = [
+    "Position",
+    "Name + ID",
+    "Name",
+    "ID",
+    "Roster Position",
+    "Salary",
+    "Game Info",
+    "TeamAbbrev",
+    "Injury Status",
+]
+
+
+class DraftKingsClient:
+    """Finds NBA draft groups and their salaries through DraftKings' public JSON endpoints."""
+
+    def __init__(
+        self,
+        lobby_url: str = LOBBY_URL,
+        draftables_url: str = DRAFTABLES_URL,
+        cache_max_age: int = RESPONSE_CACHE_MAX_AGE,
+        record_directory: str | None = None,
+        session=None,
+    ):
+        import requests
+
+        self.lobby_url = lobby_url
+        self.draftables_url = draftables_url
+        self.cache_max_age = cache_max_age
+        self.record_directory = record_directory
+        self.session = session or requests.Session()
+        self.session.headers.setdefault("User-Agent", "Mozilla/5.0")
+
+    def get_draft_groups(self) -> list[dict]:
+        lobby = self._get_json(self.lobby_url, record_name="lobby.json")
+        return [
+            draft_group
+            for draft_group in lobby.get("DraftGroups", [])
+            if draft_group.get("ContestTypeId") == CLASSIC_CONTEST_TYPE_ID
+        ]
+
+    def find_main_draft_group(self) -> dict | None:
+        draft_groups = self.get_draft_groups()
+        if not draft_groups:
+            return None
+
+        return max(
+            draft_groups,
+            key=lambda draft_group: (
+                draft_group.get("DraftGroupTag") == "Featured",
+                draft_group.get("GameCount", 0),
+                -_start_timestamp(draft_group),
+            ),
+        )
+
+    def get_salaries(self, draft_group_id: int) -> pd.DataFrame:
+        draftables = self._get_json(
+            self.draftables_url.format(draft_group_id=draft_group_id),
+            record_name=f"draftables_{draft_group_id}.json",
+        )
+
+        rows = []
+        seen_players = set()
+        for draftable in draftables.get("draftables", []):
+            player_id = draftable.get("playerId", draftable.get("draftableId"))
+            if player_id in seen_players:
+                continue
+            seen_players.add(player_id)
+
+            name = draftable.get("displayName", "")
+            draftable_id = draftable.get("draftableId")
+            position = draftable.get("position", "")
+            status = draftable.get("status") or ""
+            competition = draftable.get("competition") or {}
+            rows.append(
+                {
+                    "Position": position,
+                    "Name + ID": f"{name} ({draftable_id})",
+                    "Name": name,
+                    "ID": draftable_id,
+                    "Roster Position": _dk_roster_positions(position),
+                    "Salary": draftable.get("salary"),
+                    "Game Info": _dk_game_info(competition),
+                    "TeamAbbrev": draftable.get("teamAbbreviation"),
+                    "Injury Status": "" if status == "None" else status,
+                }
+            )
+
+        return pd.DataFrame(rows, columns=SALARY_COLUMNS)
+
+    def download_salaries(self, path: str, draft_group_id: int | None = None) -> str:
+        if draft_group_id is None:
+            draft_group = self.find_main_draft_group()
+            if draft_group is None:
+                raise ValueError("No DraftKings NBA classic draft group found.")
+            draft_group_id = draft_group["DraftGroupId"]
+
+        self.get_salaries(draft_group_id).to_csv(path, index=False)
+        return path
+
+    def _get_json(self, url: str, record_name: str) -> dict:
+        targets = []
+        if self.cache_max_age > 0:
+            path = cache_path("draftkings", f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.json")
+            if os.path.exists(path) and time.time() - os.path.getmtime(path) < self.cache_max_age:
+                with open(path, encoding="utf-8") as handle:
+                    return json.load(handle)
+            targets.append(path)
+
+        response = self.session.get(url, timeout=20)
+        response.raise_for_status()
+        payload = response.json()
+
+        if self.record_directory:
+            targets.append(os.path.join(self.record_directory, record_name))
+        for target in targets:
+            os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+            with open(target, "w", encoding="utf-8") as handle:
+                json.dump(payload, handle)
+
+        return payload
+
+
+def serve_recorded_responses(directory: str, port: int = 0) -> tuple:
+    """Serve recorded lobby and draftables JSON locally; returns the server and its base URL."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class RecordedResponseHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?", 1)[0].rstrip("/")
+            if path.endswith("/lobby/getcontests"):
+                file_name = "lobby.json"
+            elif path.endswith("/draftables"):
+                file_name = f"draftables_{path.split('/')[-2]}.json"
+            else:
+                file_name = None
+
+            file_path = os.path.join(directory, file_name) if file_name else None
+            if not file_path or not os.path.exists(file_path):
+                self.send_error(404)
+                return
+
+            with open(file_path, "rb") as handle:
+                body = handle.read()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            return
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), RecordedResponseHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def recorded_client(base_url: str, **kwargs) -> DraftKingsClient:
+    return DraftKingsClient(
+        lobby_url=f"{base_url}/lobby/getcontests?sport=NBA",
+        draftables_url=base_url + "/draftgroups/v1/draftgroups/{draft_group_id}/draftables",
+        **kwargs,
+    )
+
+
+def _dk_game_info(competition: dict) -> str:
+    name = str(competition.get("name", "")).replace(" @ ", "@")
+    start_time = competition.get("startTime")
+    if not start_time:
+        return name
+
+    try:
+        start = pd.Timestamp(start_time).tz_convert("America/New_York")
+    except (ValueError, TypeError):
+        return name
+    return f"{name} {start.strftime('%m/%d/%Y %I:%M%p')} ET"
+
+
+def _dk_roster_positions(position: str) -> str:
+    positions = [value for value in str(position).split("/") if value]
+    slots = list(positions)
+    if any(value in {"PG", "SG"} for value in positions):
+        slots.append("G")
+    if any(value in {"SF", "PF"} for value in positions):
+        slots.append("F")
+    slots.append("UTIL")
+    return "/".join(slots)
+
+
+def _start_timestamp(draft_group: dict) -> float:
+    start = draft_group.get("StartDateEst") or draft_group.get("StartDate")
+    if not start:
+        return 0.0
+
+    text = str(start)
+    if text.startswith("/Date("):
+        return int(text[6:].split(")")[0].split("-")[0].split("+")[0]) / 1000.0
+    try:
+        return pd.Timestamp(text).timestamp()
+    except ValueError:
+        return 0.0
+
 def get_credentials():
+    import sqlite3
+
     # Check if database exists and read credentials
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
@@ -24,6 +238,8 @@ def get_credentials():
         return None, None
 
 def store_credentials(username, password):
+    import sqlite3
+
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     # Clear old credentials if any
@@ -44,6 +260,9 @@ def login_to_draftkings(username, password):
     Returns:
         dict: A dictionary containing the contest_id, draft_group_id, and constructed URLs.
     """
+    from selenium import webdriver
+    from selenium.webdriver.common.by import By
+
     url = "https://www.draftkings.com/lobby#/NBA/0/All"
 
     # Initialize Selenium WebDriver
@@ -71,7 +290,7 @@ def login_to_draftkings(username, password):
     finally:
         driver.quit()
 
-def main():
+def login():
     username, password = get_credentials()
 
     if username is None or password is None:
@@ -100,10 +319,49 @@ def main():
             else:
                 print("Login failed again.")
 
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Download a DraftKings NBA salary CSV without a browser")
+    parser.add_argument("--output", default="DKSalaries.csv", help="Salary CSV path")
+    parser.add_argument("--draft-group", type=int, default=None, help="Draft group id, defaults to the main slate")
+    parser.add_argument("--list", action="store_true", help="List NBA classic draft groups and exit")
+    parser.add_argument("--record", default=None, help="Also save the raw lobby and draftables responses here")
+    parser.add_argument("--replay", default=None, help="Serve recorded responses from this directory instead")
+    parser.add_argument("--login", action="store_true", help="Run the legacy Selenium login check")
+    args = parser.parse_args()
+
+    if args.login:
+        # Set restrictive permissions on the DB file (if on a Unix-like system)
+        if not os.path.exists(DB_PATH):
+            open(DB_PATH, 'w').close()
+        os.chmod(DB_PATH, 0o600)
+        login()
+        return 0
+
+    if args.replay:
+        server, base_url = serve_recorded_responses(args.replay)
+        client = recorded_client(base_url, cache_max_age=0)
+    else:
+        server = None
+        client = DraftKingsClient(record_directory=args.record)
+
+    try:
+        if args.list:
+            for draft_group in client.get_draft_groups():
+                details = [
+                    f"{draft_group.get('GameCount')} games",
+                    draft_group.get("DraftGroupTag"),
+                    draft_group.get("StartDateEst"),
+                ]
+                print(f"{draft_group.get('DraftGroupId')}: " + ", ".join(str(detail) for detail in details if detail))
+            return 0
+
+        client.download_salaries(args.output, draft_group_id=args.draft_group)
+        print(f"Saved DraftKings salaries to {args.output}")
+        return 0
+    finally:
+        if server is not None:
+            server.shutdown()
+
+
 if __name__ == "__main__":
-    # Set restrictive permissions on the DB file (if on a Unix-like system)
-    if not os.path.exists(DB_PATH):
-        open(DB_PATH, 'w').close()
-    os.chmod(DB_PATH, 0o600)
-    
-    main()
+    raise SystemExit(main())
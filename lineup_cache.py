@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+import pickle
+from collections import OrderedDict
+from dataclasses import asdict, replace
+
+import pandas as pd
+
+from dfs_core import CACHE_DIR
+from lineup_optimizer import SITE_RULES, LineupResult, SolverConfig, build_lineup
+
+LINEUP_KEY_COLUMNS = ["Player", "Tm", "Salary", "FP", "Positions", "Ineligible"]
+
+
+def lineup_cache_key(
+    players: pd.DataFrame,
+    site: str = "yahoo",
+    selected_players: list[str] | None = None,
+    excluded_players: list[str] | None = None,
+    solver_config: SolverConfig | None = None,
+    **options,
+) -> str:
+    pool_columns = []
+    for column in LINEUP_KEY_COLUMNS:
+        if column not in players.columns:
+            pool_columns.append(None)
+        elif column in {"Salary", "FP"}:
+            pool_columns.append(pd.to_numeric(players[column], errors="coerce").fillna(0.0).astype(float).tolist())
+        else:
+            pool_columns.append(players[column].tolist())
+
+    solver_settings = asdict(solver_config or SolverConfig())
+    solver_settings.pop("msg", None)
+    settings = {
+        "pool": pool_columns,
+        "site": site,
+        "rules": SITE_RULES[site],
+        "selected": sorted(selected_players or []),
+        "excluded": sorted(excluded_players or []),
+        "solver": solver_settings,
+        "options": options,
+    }
+
+    return hashlib.sha256(json.dumps(settings, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class LineupCache:
+    """Two-tier cache of solved lineups keyed by lineup_cache_key."""
+
+    def __init__(self, max_entries: int = 256, directory: str | None = None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.entries: OrderedDict[str, LineupResult] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, key: str) -> LineupResult | None:
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return _copy_result(self.entries[key])
+
+        result = self._read_disk(key)
+        if result is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._remember(key, result)
+        return _copy_result(result)
+
+    def put(self, key: str, result: LineupResult) -> None:
+        result = _copy_result(result)
+        self._remember(key, result)
+        if self.directory:
+            path = self._disk_path(key)
+            temporary_path = f"{path}.tmp"
+            with open(temporary_path, "wb") as handle:
+                pickle.dump(result, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, path)
+            self._prune_disk()
+
+    def clear(self) -> None:
+        self.entries.clear()
+        if self.directory:
+            for name in os.listdir(self.directory):
+                if name.endswith(".pkl"):
+                    os.remove(os.path.join(self.directory, name))
+
+    def _remember(self, key: str, result: LineupResult) -> None:
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def _read_disk(self, key: str) -> LineupResult | None:
+        if not self.directory:
+            return None
+
+        path = self._disk_path(key)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, "rb") as handle:
+                result = pickle.load(handle)
+            os.utime(path)
+            return result
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def _prune_disk(self) -> None:
+        # The disk tier keeps the same number of entries as memory, evicting the least recently used.
+        paths = [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith(".pkl")]
+        if len(paths) <= self.max_entries:
+            return
+        for path in sorted(paths, key=os.path.getmtime)[: len(paths) - self.max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pkl")
+
+
+def _copy_result(result: LineupResult) -> LineupResult:
+    solve_stats = replace(result.solve_stats) if result.solve_stats is not None else None
+    return replace(result, lineup=result.lineup.copy(), solve_stats=solve_stats)
+
+
+_default_cache: LineupCache | None = None
+
+
+def default_lineup_cache() -> LineupCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = LineupCache(directory=os.path.join(CACHE_DIR, "lineups"))
+    return _default_cache
+
+
+def cached_build_lineup(
+    players: pd.DataFrame,
+    site: str = "yahoo",
+    lineup_name: str | None = None,
+    selected_players: list[str] | None = None,
+    excluded_players: list[str] | None = None,
+    solver_config: SolverConfig | None = None,
+    cache: LineupCache | None = None,
+    **options,
+) -> LineupResult:
+    cache = cache or default_lineup_cache()
+    key = lineup_cache_key(
+        players,
+        site=site,
+        selected_players=selected_players,
+        excluded_players=excluded_players,
+        solver_config=solver_config,
+        **options,
+    )
+
+    result = cache.get(key)
+    if result is not None:
+        result.lineup_name = lineup_name
+        return result
+
+    result = build_lineup(
+        players,
+        site=site,
+        lineup_name=lineup_name,
+        selected_players=selected_players,
+        excluded_players=excluded_players,
+        solver_config=solver_config,
+        **options,
+    )
+    cache.put(key, result)
+    return result
@@ -1,7 +1,8 @@
+import time
+from collections import Counter
 from dataclasses import dataclass
 
 import pandas as pd
-from pulp import LpMaximize, LpProblem, LpStatus, LpVariable, lpSum
 
 from dfs_core import normalize_positions
 
@@ -16,6 +17,8 @@ SITE_RULES = {
     },
 }
 
+LINEUP_FORMULATIONS = ["slot", "player"]
+
 FANTASY_POINTS_WEIGHTS = {
     "PTS": 1.0,
     "TRB": 1.2,
@@ -26,25 +29,113 @@ FANTASY_POINTS_WEIGHTS = {
 }
 
 
+@dataclass
+class SolverConfig:
+    backend: str = "cbc"
+    time_limit: float | None = None
+    threads: int | None = None
+    gap: float | None = None
+    msg: bool = False
+
+
+@dataclass
+class SolveStats:
+    backend: str
+    solver_status: str
+    solution_status: str
+    solve_seconds: float
+    objective: float | None
+    variables: int
+    constraints: int
+
+
 @dataclass
 class LineupResult:
     lineup: pd.DataFrame
     total_salary: float
     projected_points: float
     solver_status: str
+    solve_stats: SolveStats | None = None
+    lineup_name: str | None = None
+
+
+@dataclass
+class LineupModel:
+    model: object
+    player_pool: pd.DataFrame
+    site: str
+    assignment_vars: dict
+    player_variables: dict[str, list]
+    formulation: str = "slot"
+
+
+def _cbc_backend(config: SolverConfig):
+    from pulp import PULP_CBC_CMD
+
+    return PULP_CBC_CMD(msg=config.msg, timeLimit=config.time_limit, threads=config.threads, gapRel=config.gap)
 
 
-def calculate_fantasy_points(players: pd.DataFrame, dvp_data: dict[str, pd.DataFrame], apply_dvp: bool = True) -> pd.DataFrame:
+def _highs_backend(config: SolverConfig):
+    from pulp import HiGHS
+
+    return HiGHS(msg=config.msg, timeLimit=config.time_limit, threads=config.threads, gapRel=config.gap)
+
+
+SOLVER_BACKENDS = {
+    "cbc": _cbc_backend,
+    "highs": _highs_backend,
+}
+
+
+def register_solver_backend(name: str, factory) -> None:
+    """Register a callable that turns a SolverConfig into a PuLP solver instance."""
+    SOLVER_BACKENDS[name.lower()] = factory
+
+
+def available_solver_backends() -> list[str]:
+    available = []
+    for name, factory in SOLVER_BACKENDS.items():
+        try:
+            solver = factory(SolverConfig(backend=name))
+        except Exception:
+            continue
+        if solver.available():
+            available.append(name)
+    return available
+
+
+def get_solver(config: SolverConfig | None = None):
+    config = config or SolverConfig()
+    backend = config.backend.lower()
+    if backend not in SOLVER_BACKENDS:
+        raise ValueError(f"Unsupported solver backend: {config.backend}")
+
+    solver = SOLVER_BACKENDS[backend](config)
+    if not solver.available():
+        raise ValueError(f"Solver backend {config.backend} is not available in this environment.")
+    return solver
+
+
+def calculate_fantasy_points(
+    players: pd.DataFrame,
+    dvp_data: dict[str, pd.DataFrame],
+    apply_dvp: bool = True,
+    team_context: pd.DataFrame | None = None,
+) -> pd.DataFrame:
     projected_players = players.copy()
 
     for stat in FANTASY_POINTS_WEIGHTS:
         projected_players[stat] = pd.to_numeric(projected_players[stat], errors="coerce").fillna(0.0)
 
+    if team_context is not None and not team_context.empty:
+        multipliers = team_matchup_multipliers(projected_players, team_context)
+        projected_players[multipliers.columns] = (projected_players[multipliers.columns] * multipliers).round(2)
+
     if apply_dvp:
         for index, player in projected_players.iterrows():
             positions = normalize_positions(player.get("Positions"))
             opponent = player.get("Opponent")
-            position = _pick_dvp_position(positions, dvp_data)
+            position = pick_dvp_position(positions, dvp_data)
 
             if not position or position not in dvp_data or opponent not in dvp_data[position].index:
                 continue
@@ -69,13 +160,56 @@ def calculate_fantasy_points(players: pd.DataFrame, dvp_data: dict[str, pd.DataF
     return projected_players
 
 
+def team_matchup_multipliers(players: pd.DataFrame, team_context: pd.DataFrame) -> pd.DataFrame:
+    context = team_context.set_index("Team")
+    stats = [stat for stat in FANTASY_POINTS_WEIGHTS if f"OPP_{stat}" in context.columns]
+
+    # Opponent-allowed stats per 100 possessions relative to the league, scaled by the expected game pace.
+    allowed = context[[f"OPP_{stat}" for stat in stats]].div(context["PACE"], axis=0)
+    allowed.columns = stats
+    allowed_factor = allowed / allowed.mean()
+
+    matchup = players[["Tm", "Opponent"]].join(allowed_factor, on="Opponent")
+    matchup = matchup.join(context["PACE"].rename("TeamPace"), on="Tm")
+    matchup = matchup.join(context["PACE"].rename("OpponentPace"), on="Opponent")
+    pace_factor = (((matchup["TeamPace"] + matchup["OpponentPace"]) / 2.0) / matchup["TeamPace"]).fillna(1.0)
+
+    return matchup[stats].fillna(1.0).mul(pace_factor, axis=0)
+
+
 def build_lineup(
     players: pd.DataFrame,
     site: str = "yahoo",
     lineup_name: str | None = None,
     selected_players: list[str] | None = None,
     excluded_players: list[str] | None = None,
+    solver_config: SolverConfig | None = None,
+    formulation: str = "slot",
 ) -> LineupResult:
+    lineup_model = build_lineup_model(
+        players,
+        site=site,
+        selected_players=selected_players,
+        excluded_players=excluded_players,
+        formulation=formulation,
+    )
+    result = solve_lineup_model(lineup_model, solver_config=solver_config)
+    result.lineup_name = lineup_name
+    return result
+
+
+def build_lineup_model(
+    players: pd.DataFrame,
+    site: str = "yahoo",
+    selected_players: list[str] | None = None,
+    excluded_players: list[str] | None = None,
+    formulation: str = "slot",
+) -> LineupModel:
+    from pulp import LpAffineExpression, LpMaximize, LpProblem, LpVariable, lpSum
+
+    if formulation not in LINEUP_FORMULATIONS:
+        raise ValueError(f"Unsupported lineup formulation: {formulation}")
+
     selected_players = selected_players or []
     excluded_players = set(excluded_players or [])
 
@@ -88,62 +222,138 @@ def build_lineup(
     player_pool["FP"] = pd.to_numeric(player_pool["FP"], errors="coerce").fillna(0.0)
     player_pool["Positions"] = player_pool["Positions"].apply(normalize_positions)
     player_pool["EligibleSlots"] = player_pool["Positions"].apply(lambda positions: _eligible_slots(site, positions))
+    if "Ineligible" not in player_pool.columns:
+        player_pool["Ineligible"] = False
 
     model = LpProblem(f"{site.upper()}_DFS_Lineup", LpMaximize)
 
     assignment_vars = {}
-    for player_index, player in player_pool.iterrows():
-        for slot in player["EligibleSlots"]:
-            assignment_vars[(player_index, slot)] = LpVariable(f"player_{player_index}_{slot}", cat="Binary")
-
-    model += lpSum(
-        player_pool.at[player_index, "FP"] * variable
-        for (player_index, _slot), variable in assignment_vars.items()
+    slot_variables = {slot: [] for slot in roster_slots}
+    player_variables = {}
+    eligibility_variables = {}
+    objective_terms = []
+    salary_terms = []
+    pool_columns = zip(
+        player_pool.index,
+        player_pool["Player"],
+        player_pool["EligibleSlots"],
+        player_pool["FP"],
+        player_pool["Salary"],
+        player_pool["Ineligible"],
     )
+    for player_index, player_name, eligible_slots, points, salary, ineligible in pool_columns:
+        if formulation == "player":
+            if not eligible_slots:
+                continue
+            variable = LpVariable(f"player_{player_index}", cat="Binary")
+            assignment_vars[player_index] = variable
+            player_variables.setdefault(player_name, []).append(variable)
+            objective_terms.append((variable, points))
+            salary_terms.append((variable, salary))
+            eligibility_variables.setdefault(frozenset(eligible_slots), []).append(variable)
+
+            if (pd.notna(ineligible) and bool(ineligible)) or player_name in excluded_players:
+                model += variable == 0, f"Exclude_Player_{player_index}"
+            elif player_name in selected_players:
+                model += variable == 1, f"Lock_Player_{player_index}"
+            continue
 
-    for slot in roster_slots:
-        model += lpSum(
-            variable for (player_index, candidate_slot), variable in assignment_vars.items() if candidate_slot == slot
-        ) == 1, f"Fill_{slot}"
+        variables = []
+        for slot in eligible_slots:
+            variable = LpVariable(f"player_{player_index}_{slot}", cat="Binary")
+            assignment_vars[(player_index, slot)] = variable
+            slot_variables[slot].append(variable)
+            variables.append(variable)
+            objective_terms.append((variable, points))
+            salary_terms.append((variable, salary))
 
-    for player_index, player in player_pool.iterrows():
-        player_variables = [
-            variable for (candidate_index, _slot), variable in assignment_vars.items() if candidate_index == player_index
-        ]
-        if not player_variables:
+        if not variables:
             continue
 
-        model += lpSum(player_variables) <= 1, f"Use_Player_{player_index}"
+        player_variables.setdefault(player_name, []).extend(variables)
+        model_variables = lpSum(variables)
+        model += model_variables <= 1, f"Use_Player_{player_index}"
 
-        player_name = player["Player"]
-        if player.get("Ineligible", False) or player_name in excluded_players:
-            model += lpSum(player_variables) == 0, f"Exclude_Player_{player_index}"
+        if (pd.notna(ineligible) and bool(ineligible)) or player_name in excluded_players:
+            model += model_variables == 0, f"Exclude_Player_{player_index}"
         elif player_name in selected_players:
-            model += lpSum(player_variables) == 1, f"Lock_Player_{player_index}"
+            model += model_variables == 1, f"Lock_Player_{player_index}"
+
+    model.setObjective(LpAffineExpression(objective_terms))
+
+    if formulation == "player":
+        model += lpSum(assignment_vars.values()) == len(roster_slots), "Roster_Size"
+        slot_counts = Counter(roster_slots)
+        for slot_union in _eligibility_unions(eligibility_variables):
+            capacity = sum(slot_counts[slot] for slot in slot_union)
+            if capacity >= len(roster_slots):
+                continue
+            variables = [
+                variable
+                for eligible_slots, group in eligibility_variables.items()
+                if eligible_slots <= slot_union
+                for variable in group
+            ]
+            model += lpSum(variables) <= capacity, f"Fit_{'_'.join(sorted(slot_union))}"
+    else:
+        for slot in roster_slots:
+            model += lpSum(slot_variables[slot]) == 1, f"Fill_{slot}"
+
+    model += LpAffineExpression(salary_terms) <= salary_cap, "Salary_Cap"
+
+    return LineupModel(
+        model=model,
+        player_pool=player_pool,
+        site=site,
+        assignment_vars=assignment_vars,
+        player_variables=player_variables,
+        formulation=formulation,
+    )
+
 
-    model += lpSum(
-        player_pool.at[player_index, "Salary"] * variable
-        for (player_index, _slot), variable in assignment_vars.items()
-    ) <= salary_cap, "Salary_Cap"
+def solve_lineup_model(lineup_model: LineupModel, solver_config: SolverConfig | None = None) -> LineupResult:
+    from pulp import LpSolution, LpStatus
+
+    solver_config = solver_config or SolverConfig()
+    model = lineup_model.model
+    player_pool = lineup_model.player_pool
+    roster_slots = SITE_RULES[lineup_model.site]["roster_slots"]
+
+    solver = get_solver(solver_config)
+    started = time.perf_counter()
+    model.solve(solver)
+    solve_seconds = time.perf_counter() - started
 
-    model.solve()
     solver_status = LpStatus.get(model.status, str(model.status))
     if solver_status != "Optimal":
         raise ValueError(f"Lineup solver did not find an optimal lineup. Status: {solver_status}")
 
+    solve_stats = SolveStats(
+        backend=solver_config.backend.lower(),
+        solver_status=solver_status,
+        solution_status=LpSolution.get(model.sol_status, str(model.sol_status)),
+        solve_seconds=round(solve_seconds, 4),
+        objective=model.objective.value(),
+        variables=len(model.variables()),
+        constraints=len(model.constraints),
+    )
+
+    chosen = [key for key, variable in lineup_model.assignment_vars.items() if _is_chosen(variable)]
+    if lineup_model.formulation == "player":
+        chosen = _assign_slots(chosen, player_pool["EligibleSlots"], roster_slots)
+
     lineup_rows = []
-    for (player_index, slot), variable in assignment_vars.items():
-        if variable.varValue == 1.0:
-            lineup_rows.append(
-                {
-                    "RosterSlot": slot,
-                    "Player": player_pool.at[player_index, "Player"],
-                    "Positions": "/".join(player_pool.at[player_index, "Positions"]),
-                    "Tm": player_pool.at[player_index, "Tm"],
-                    "Salary": player_pool.at[player_index, "Salary"],
-                    "FP": round(player_pool.at[player_index, "FP"], 2),
-                }
-            )
+    for player_index, slot in chosen:
+        lineup_rows.append(
+            {
+                "RosterSlot": slot,
+                "Player": player_pool.at[player_index, "Player"],
+                "Positions": "/".join(player_pool.at[player_index, "Positions"]),
+                "Tm": player_pool.at[player_index, "Tm"],
+                "Salary": player_pool.at[player_index, "Salary"],
+                "FP": round(player_pool.at[player_index, "FP"], 2),
+            }
+        )
 
     lineup = pd.DataFrame(lineup_rows)
     lineup["RosterSlot"] = pd.Categorical(lineup["RosterSlot"], roster_slots, ordered=True)
@@ -154,9 +364,44 @@ def build_lineup(
         total_salary=float(lineup["Salary"].sum()),
         projected_points=round(float(lineup["FP"].sum()), 2),
         solver_status=solver_status,
+        solve_stats=solve_stats,
     )
 
 
+def _is_chosen(variable) -> bool:
+    return variable.varValue is not None and variable.varValue > 0.5
+
+
+def _eligibility_unions(eligibility_variables: dict[frozenset, list]) -> set[frozenset]:
+    # Hall's condition only needs checking on slot sets that some group of players can reach,
+    # i.e. unions of the eligibility sets present in the pool.
+    unions = set()
+    for eligible_slots in eligibility_variables:
+        unions |= {eligible_slots | union for union in unions}
+        unions.add(eligible_slots)
+    return unions
+
+
+def _assign_slots(player_indexes: list, eligible_slots: pd.Series, roster_slots: list[str]) -> list[tuple]:
+    slot_players = [None] * len(roster_slots)
+
+    def place(player_index, visited: set[int]) -> bool:
+        for position, slot in enumerate(roster_slots):
+            if slot not in eligible_slots[player_index] or position in visited:
+                continue
+            visited.add(position)
+            if slot_players[position] is None or place(slot_players[position], visited):
+                slot_players[position] = player_index
+                return True
+        return False
+
+    for player_index in player_indexes:
+        if not place(player_index, set()):
+            raise ValueError("Selected players cannot fill every roster slot.")
+
+    return [(player_index, slot) for player_index, slot in zip(slot_players, roster_slots) if player_index is not None]
+
+
 def _eligible_slots(site: str, positions: list[str]) -> list[str]:
     slots = []
     normalized_positions = normalize_positions(positions)
@@ -188,7 +433,7 @@ def _percent_to_multiplier(value) -> float:
     return (float(text) / 100.0) + 1.0
 
 
-def _pick_dvp_position(positions: list[str], dvp_data: dict[str, pd.DataFrame]) -> str | None:
+def pick_dvp_position(positions: list[str], dvp_data: dict[str, pd.DataFrame]) -> str | None:
     for position in positions:
         if position in dvp_data:
             return position
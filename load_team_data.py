@@ -1,51 +1,110 @@
-import pandas as pd
-
-def get_team_averages():
-    url = "https://www.basketball-reference.com/leagues/NBA_2025.html"
-    team_abbreviations = {
-        "Indiana Pacers": "IND",
-        "Milwaukee Bucks": "MIL",
-        "Oklahoma City Thunder": "OKC",
-        "Atlanta Hawks": "ATL",
-        "Boston Celtics": "BOS",
-        "Golden State Warriors": "GSW",
-        "Dallas Mavericks": "DAL",
-        "Sacramento Kings": "SAC",
-        "Utah Jazz": "UTA",
-        "Los Angeles Clippers": "LAC",
-        "Phoenix Suns": "PHX",
-        "Philadelphia 76ers": "PHI",
-        "Los Angeles Lakers": "LAL",
-        "New Orleans Pelicans": "NOP",
-        "Denver Nuggets": "DEN",
-        "Toronto Raptors": "TOR",
-        "Washington Wizards": "WAS",
-        "Cleveland Cavaliers": "CLE",
-        "New York Knicks": "NYK",
-        "Minnesota Timberwolves": "MIN",
-        "Houston Rockets": "HOU",
-        "Detroit Pistons": "DET",
-        "Brooklyn Nets": "BKN",
-        "San Antonio Spurs": "SAS",
-        "Chicago Bulls": "CHI",
-        "Orlando Magic": "ORL",
-        "Miami Heat": "MIA",
-        "Charlotte Hornets": "CHA",
-        "Portland Trail Blazers": "POR",
-        "Memphis Grizzlies": "MEM"
-    }
-
-    team_stats_tables = pd.read_html(url, match="Per Game Stats", flavor="lxml")
-    selected_columns = ["Team", "PTS", "TRB", "AST", "STL", "BLK", "TOV"]
-    desired_data = team_stats_tables[0][selected_columns]
-    desired_data["Team"] = desired_data["Team"].map(team_abbreviations, na_action='ignore')
-
-    return desired_data
-
-if __name__ == "__main__":
-    team_averages = get_team_averages()
-    if team_averages is not None:
-        print("NBA Team Averages (2023-24 Season):\n")
-        print(team_averages)
-    else:
-        print("Unable to retrieve data. Please try again.")
+import io
+import os
+import re
+import sys
+import time
+
+import pandas as pd
+
+from dfs_core import cache_path, normalize_team_abbreviation
+
+BASE_LEAGUE_URL = "https://www.basketball-reference.com/leagues/{}.html"
+TEAM_CONTEXT_MAX_AGE = 24 * 60 * 60
+TEAM_CONTEXT_STATS = ["PTS", "TRB", "AST", "STL", "BLK", "TOV"]
+
+TEAM_ABBREVIATIONS = {
+    "Indiana Pacers": "IND",
+    "Milwaukee Bucks": "MIL",
+    "Oklahoma City Thunder": "OKC",
+    "Atlanta Hawks": "ATL",
+    "Boston Celtics": "BOS",
+    "Golden State Warriors": "GSW",
+    "Dallas Mavericks": "DAL",
+    "Sacramento Kings": "SAC",
+    "Utah Jazz": "UTA",
+    "Los Angeles Clippers": "LAC",
+    "Phoenix Suns": "PHX",
+    "Philadelphia 76ers": "PHI",
+    "Los Angeles Lakers": "LAL",
+    "New Orleans Pelicans": "NOP",
+    "Denver Nuggets": "DEN",
+    "Toronto Raptors": "TOR",
+    "Washington Wizards": "WAS",
+    "Cleveland Cavaliers": "CLE",
+    "New York Knicks": "NYK",
+    "Minnesota Timberwolves": "MIN",
+    "Houston Rockets": "HOU",
+    "Detroit Pistons": "DET",
+    "Brooklyn Nets": "BKN",
+    "San Antonio Spurs": "SAS",
+    "Chicago Bulls": "CHI",
+    "Orlando Magic": "ORL",
+    "Miami Heat": "MIA",
+    "Charlotte Hornets": "CHA",
+    "Portland Trail Blazers": "POR",
+    "Memphis Grizzlies": "MEM",
+}
+
+
+def get_team_averages(season: str = "NBA_2025", max_age_seconds: int = TEAM_CONTEXT_MAX_AGE) -> pd.DataFrame:
+    context = get_team_context(season, max_age_seconds=max_age_seconds)
+    return context[["Team"] + TEAM_CONTEXT_STATS]
+
+
+def get_team_context(
+    season: str = "NBA_2025",
+    max_age_seconds: int = TEAM_CONTEXT_MAX_AGE,
+    refresh: bool = False,
+) -> pd.DataFrame:
+    path = cache_path("team_context", f"{season}.csv")
+    if not refresh and os.path.exists(path) and time.time() - os.path.getmtime(path) < max_age_seconds:
+        return pd.read_csv(path)
+
+    context = _scrape_team_context(season)
+    context.to_csv(path, index=False)
+    return context
+
+
+def _scrape_team_context(season: str) -> pd.DataFrame:
+    import requests
+
+    response = requests.get(BASE_LEAGUE_URL.format(season), headers={"User-Agent": "Mozilla/5.0"}, timeout=30)
+    response.raise_for_status()
+
+    # Several Basketball Reference tables are shipped inside HTML comments.
+    page = re.sub(r"<!--|-->", "", response.text)
+    per_game = _read_team_table(page, "per_game-team")
+    opponent = _read_team_table(page, "per_game-opponent")
+    advanced = _read_team_table(page, "advanced-team")
+
+    context = per_game[["Team"] + TEAM_CONTEXT_STATS].copy()
+    opponent = opponent[["Team"] + TEAM_CONTEXT_STATS].rename(
+        columns={stat: f"OPP_{stat}" for stat in TEAM_CONTEXT_STATS}
+    )
+    pace = advanced[["Team", "Pace"]].rename(columns={"Pace": "PACE"})
+
+    context = context.merge(opponent, on="Team").merge(pace, on="Team")
+    numeric_columns = [column for column in context.columns if column != "Team"]
+    context[numeric_columns] = context[numeric_columns].apply(pd.to_numeric, errors="coerce")
+    return context.dropna().reset_index(drop=True)
+
+
+def _read_team_table(page: str, table_id: str) -> pd.DataFrame:
+    table = pd.read_html(io.StringIO(page), attrs={"id": table_id}, flavor="lxml")[0]
+    if isinstance(table.columns, pd.MultiIndex):
+        table.columns = table.columns.get_level_values(-1)
+
+    table = table.loc[:, ~table.columns.duplicated()]
+    table["Team"] = table["Team"].astype(str).str.replace("*", "", regex=False).str.strip()
+    table["Team"] = table["Team"].map(TEAM_ABBREVIATIONS).map(normalize_team_abbreviation, na_action="ignore")
+    return table.dropna(subset=["Team"])
+
+
+if __name__ == "__main__":
+    season = sys.argv[1] if len(sys.argv) > 1 else "NBA_2025"
+    team_context = get_team_context(season)
+    if team_context is not None:
+        print(f"NBA Team Context ({season}):\n")
+        print(team_context)
+    else:
+        print("Unable to retrieve data. Please try again.")
@@ -0,0 +1,175 @@
+import json
+import os
+import re
+from collections import Counter
+
+import pandas as pd
+
+from dfs_core import cache_path, normalize_team_abbreviation
+
+NAME_MATCH_MIN_SCORE = 0.6
+NAME_MATCH_SAVE_SCORE = 0.8
+TEAM_TIEBREAK_MARGIN = 0.05
+NAME_SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "v"}
+
+
+class NameIndex:
+    """Character trigram index that resolves a name to its closest candidate."""
+
+    def __init__(self, candidates: dict[str, str | None]):
+        self.names = list(candidates)
+        self.teams = [normalize_team_abbreviation(team) if team else None for team in candidates.values()]
+        self.keys = [name_key(name) for name in self.names]
+        self.exact = {}
+        self.postings: dict[str, list[int]] = {}
+        self.gram_counts = []
+
+        for position, key in enumerate(self.keys):
+            self.exact.setdefault(key, []).append(position)
+            grams = _trigrams(key)
+            self.gram_counts.append(len(grams))
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(position)
+
+    def match(
+        self,
+        name: str,
+        team: str | None = None,
+        min_score: float = NAME_MATCH_MIN_SCORE,
+        exclude: set[str] | frozenset[str] = frozenset(),
+    ) -> str | None:
+        best = self.scored_match(name, team=team, min_score=min_score, exclude=exclude)
+        return best[0] if best else None
+
+    def scored_match(
+        self,
+        name: str,
+        team: str | None = None,
+        min_score: float = NAME_MATCH_MIN_SCORE,
+        exclude: set[str] | frozenset[str] = frozenset(),
+    ) -> tuple[str, float] | None:
+        team = normalize_team_abbreviation(team) if team else None
+        key = name_key(name)
+        exact = [(1.0, position) for position in self.exact.get(key, []) if self.names[position] not in exclude]
+        if exact:
+            return self._best(exact, team)
+
+        grams = _trigrams(key)
+        shared = Counter(position for gram in grams for position in self.postings.get(gram, []))
+        scored = [
+            (2.0 * count / (len(grams) + self.gram_counts[position]), position)
+            for position, count in shared.items()
+            if self.names[position] not in exclude
+        ]
+        scored = [(score, position) for score, position in scored if score >= min_score]
+        return self._best(scored, team) if scored else None
+
+    def _best(self, scored: list[tuple[float, int]], team: str | None) -> tuple[str, float] | None:
+        # A candidate on another team is never accepted, so a close spelling cannot cross rosters.
+        # Among the rest, near-equal scores are settled by team before score.
+        scored = [(score, position) for score, position in scored if _same_team(team, self.teams[position])]
+        if not scored:
+            return None
+
+        best_score = max(score for score, _position in scored)
+        contenders = [(score, position) for score, position in scored if score >= best_score - TEAM_TIEBREAK_MARGIN]
+        score, position = max(
+            contenders,
+            key=lambda item: (team is not None and self.teams[item[1]] == team, item[0], -item[1]),
+        )
+        return self.names[position], score
+
+
+def match_player_names(
+    names: pd.Series,
+    teams: pd.Series | None,
+    known_teams: dict[str, str],
+    matches_path: str | None = None,
+) -> pd.Series:
+    """Rename entries of names that are not in known_teams to the contest name missing from names they best match.
+
+    A pair is only accepted when each side is the other's best remaining match, and only pairs scoring at least
+    NAME_MATCH_SAVE_SCORE are saved for later runs.
+    """
+    known_names = set(known_teams)
+    unmatched = names[~names.isin(known_names)]
+    if unmatched.empty:
+        return names
+
+    taken = set(names[names.isin(known_names)])
+    missing = {known: known_team for known, known_team in known_teams.items() if known not in taken}
+    if not missing:
+        return names
+
+    matches_path = matches_path or cache_path("name_matches.json")
+    saved_matches = _read_matches(matches_path)
+    unmatched_teams = teams.loc[unmatched.index] if teams is not None else pd.Series(None, index=unmatched.index)
+    stats_teams: dict[str, str | None] = {}
+    for name, team in zip(unmatched, unmatched_teams):
+        stats_teams.setdefault(name, normalize_team_abbreviation(team) if isinstance(team, str) and team else None)
+
+    resolved = {}
+    for name, team in stats_teams.items():
+        saved = saved_matches.get(name)
+        if saved in missing and saved not in taken and _same_team(team, missing[saved]):
+            resolved[name] = saved
+            taken.add(saved)
+
+    new_matches = {}
+    contest_index = NameIndex(missing)
+    stats_index = NameIndex({name: team for name, team in stats_teams.items() if name not in resolved})
+    progress = True
+    while progress:
+        progress = False
+        for known, known_team in missing.items():
+            if known in taken:
+                continue
+            best = stats_index.scored_match(known, team=known_team, exclude=set(resolved))
+            if best is None:
+                continue
+            name, score = best
+            reverse = contest_index.scored_match(name, team=stats_teams[name], exclude=taken)
+            if reverse is None or reverse[0] != known:
+                continue
+            resolved[name] = known
+            taken.add(known)
+            progress = True
+            if score >= NAME_MATCH_SAVE_SCORE and saved_matches.get(name) != known:
+                new_matches[name] = known
+
+    if new_matches:
+        saved_matches.update(new_matches)
+        _write_matches(matches_path, saved_matches)
+
+    return names.replace(resolved)
+
+
+def _same_team(team: str | None, candidate_team: str | None) -> bool:
+    return team is None or candidate_team is None or team == normalize_team_abbreviation(candidate_team)
+
+
+def name_key(name: str) -> str:
+    tokens = re.sub(r"[^a-z0-9 ]+", "", str(name).lower().replace("-", " ")).split()
+    return " ".join(token for token in tokens if token not in NAME_SUFFIXES)
+
+
+def _trigrams(key: str) -> set[str]:
+    padded = f"  {key} "
+    return {padded[position : position + 3] for position in range(len(padded) - 2)}
+
+
+def _read_matches(path: str) -> dict[str, str]:
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_matches(path: str, matches: dict[str, str]) -> None:
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as handle:
+        json.dump(matches, handle, indent=2, sort_keys=True)
+    os.replace(temporary_path, path)
@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+import pickle
+import time
+from dataclasses import asdict
+
+import pandas as pd
+
+from data_providers import DVP_STAT_COLUMNS, join_contest_data
+from dfs_core import ContestData, normalize_positions
+from lineup_cache import LineupCache, cached_build_lineup
+from lineup_optimizer import (
+    FANTASY_POINTS_WEIGHTS,
+    LineupResult,
+    SolverConfig,
+    calculate_fantasy_points,
+    pick_dvp_position,
+)
+
+PROJECTED_COLUMNS = list(FANTASY_POINTS_WEIGHTS) + ["FP"]
+PROJECTION_KEY_COLUMNS = ["Player", "Tm", "Opponent", "Positions"] + list(FANTASY_POINTS_WEIGHTS)
+
+
+class LineupPipeline:
+    """Slate stages (stats join, projections, lineup) that recompute only what their inputs changed."""
+
+    def __init__(self, site: str = "yahoo", lineup_cache: LineupCache | None = None):
+        self.site = site
+        self.lineup_cache = lineup_cache or LineupCache(max_entries=16)
+        self.inputs: dict[str, object] = {}
+        self.fingerprints: dict[str, str] = {}
+        self.stages: dict[str, tuple[tuple, object]] = {}
+        self.row_keys: dict[str, int] = {}
+        self.last_run: dict[str, object] = {}
+
+    def update(self, **inputs) -> None:
+        # Inputs: contest_data, player_stats (FantasyPros averages before the contest join, unless
+        # stats_joined is set as for snapshot stats), dvp_data, team_context, apply_dvp.
+        for name, value in inputs.items():
+            self.inputs[name] = value
+            self.fingerprints[name] = _fingerprint(value)
+
+    def player_stats(self) -> pd.DataFrame:
+        return self._stage(
+            "player_stats",
+            ("contest_data", "player_stats", "stats_joined"),
+            self._join_player_stats,
+        )
+
+    def _join_player_stats(self) -> pd.DataFrame:
+        if self.inputs.get("stats_joined"):
+            return self.inputs["player_stats"]
+        return join_contest_data(self.inputs["player_stats"], self.inputs["contest_data"])
+
+    def projections(self) -> pd.DataFrame:
+        player_stats = self.player_stats()
+        key = (
+            self._stage_key("player_stats"),
+            self.fingerprints.get("dvp_data"),
+            self.fingerprints.get("team_context"),
+            self.fingerprints.get("apply_dvp"),
+        )
+        cached = self.stages.get("projections")
+        if cached is not None and cached[0] == key:
+            self.last_run["projections"] = 0
+            return cached[1]
+
+        # Team context multipliers are relative to a league average, so a change there invalidates
+        # every row; otherwise only rows whose stats or DVP cell changed are reprojected.
+        dvp_data = self.inputs.get("dvp_data") or {}
+        apply_dvp = bool(self.inputs.get("apply_dvp", True)) and bool(dvp_data)
+        row_keys = _projection_row_keys(player_stats, dvp_data if apply_dvp else {})
+
+        reusable = (
+            cached is not None
+            and cached[0][2:] == key[2:]
+            and not player_stats["Player"].duplicated().any()
+            and not cached[1]["Player"].duplicated().any()
+        )
+        previous_keys = self.row_keys if reusable else {}
+        changed = pd.Series(
+            [previous_keys.get(player) != row_key for player, row_key in zip(player_stats["Player"], row_keys)],
+            index=player_stats.index,
+        )
+
+        reprojected = calculate_fantasy_points(
+            player_stats[changed],
+            dvp_data=dvp_data,
+            apply_dvp=apply_dvp,
+            team_context=self.inputs.get("team_context"),
+        )
+        if changed.all():
+            projected = reprojected
+        else:
+            # Unchanged rows keep their projected stats but take every other column (salary,
+            # eligibility, ids) from the fresh join.
+            kept = player_stats[~changed].copy()
+            previous = cached[1].set_index("Player")
+            kept[PROJECTED_COLUMNS] = previous.loc[kept["Player"], PROJECTED_COLUMNS].to_numpy()
+            projected = pd.concat([kept, reprojected]).loc[player_stats.index]
+
+        self.row_keys = dict(zip(player_stats["Player"], row_keys))
+        self.stages["projections"] = (key, projected)
+        self.last_run["projections"] = int(changed.sum())
+        return projected
+
+    def lineup(
+        self,
+        selected_players: list[str] | None = None,
+        excluded_players: list[str] | None = None,
+        solver_config: SolverConfig | None = None,
+        **options,
+    ) -> LineupResult:
+        hits = self.lineup_cache.hits
+        result = cached_build_lineup(
+            self.projections(),
+            site=self.site,
+            selected_players=selected_players,
+            excluded_players=excluded_players,
+            solver_config=solver_config,
+            cache=self.lineup_cache,
+            **options,
+        )
+        self.last_run["lineup_cached"] = self.lineup_cache.hits > hits
+        return result
+
+    def save(self, path: str) -> None:
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "wb") as handle:
+            pickle.dump(self, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path: str, site: str = "yahoo") -> "LineupPipeline":
+        if os.path.exists(path):
+            try:
+                with open(path, "rb") as handle:
+                    pipeline = pickle.load(handle)
+                if isinstance(pipeline, cls) and pipeline.site == site:
+                    return pipeline
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+                pass
+        return cls(site=site)
+
+    def _stage(self, name: str, input_names: tuple[str, ...], compute):
+        key = tuple(self.fingerprints.get(input_name) for input_name in input_names)
+        cached = self.stages.get(name)
+        if cached is not None and cached[0] == key:
+            self.last_run[name] = 0.0
+            return cached[1]
+
+        started = time.perf_counter()
+        output = compute()
+        self.stages[name] = (key, output)
+        self.last_run[name] = round(time.perf_counter() - started, 4)
+        return output
+
+    def _stage_key(self, name: str) -> tuple:
+        return self.stages[name][0]
+
+
+def _projection_row_keys(player_stats: pd.DataFrame, dvp_data: dict[str, pd.DataFrame]) -> list[int]:
+    dvp_cells = {}
+    if dvp_data:
+        dvp_frame = pd.concat(dvp_data).reindex(columns=list(DVP_STAT_COLUMNS.values()))
+        dvp_cells = dict(zip(dvp_frame.index, _hash_rows(dvp_frame).tolist()))
+
+    key_frame = player_stats.reindex(columns=PROJECTION_KEY_COLUMNS).copy()
+    key_frame["DvpCell"] = [
+        dvp_cells.get((pick_dvp_position(normalize_positions(positions), dvp_data), opponent), 0)
+        for positions, opponent in zip(player_stats["Positions"], player_stats["Opponent"])
+    ]
+    return _hash_rows(key_frame).tolist()
+
+
+def _hash_rows(frame: pd.DataFrame, index: bool = False):
+    # List-valued cells such as Positions are not hashable, so object columns are hashed as text.
+    hashable = frame.apply(lambda column: column.astype(str) if column.dtype == object else column)
+    return pd.util.hash_pandas_object(hashable, index=index).to_numpy()
+
+
+def _fingerprint(value) -> str:
+    digest = hashlib.sha256()
+    if isinstance(value, pd.DataFrame):
+        digest.update(json.dumps(list(map(str, value.columns))).encode("utf-8"))
+        digest.update(_hash_rows(value, index=True).tobytes())
+    elif isinstance(value, dict) and value and all(isinstance(frame, pd.DataFrame) for frame in value.values()):
+        digest.update(_fingerprint(pd.concat(value, sort=True)).encode("utf-8"))
+    elif isinstance(value, ContestData):
+        digest.update(json.dumps(asdict(value), sort_keys=True, default=str).encode("utf-8"))
+    else:
+        digest.update(json.dumps(value, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
@@ -0,0 +1,283 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from lineup_optimizer import (
+    SITE_RULES,
+    LineupModel,
+    LineupResult,
+    SolverConfig,
+    build_lineup_model,
+    solve_lineup_model,
+)
+
+
+@dataclass
+class PortfolioSettings:
+    num_lineups: int = 150
+    max_exposure: float = 1.0
+    max_team_exposure: float = 1.0
+    min_unique: int = 1
+    player_exposure: dict[str, float] = field(default_factory=dict)
+    team_exposure: dict[str, float] = field(default_factory=dict)
+
+    def player_cap(self, player_name: str, num_lineups: int | None = None) -> int:
+        exposure = self.player_exposure.get(player_name, self.max_exposure)
+        return math.floor(exposure * (num_lineups or self.num_lineups) + 1e-9)
+
+    def team_cap(self, team: str, num_lineups: int | None = None) -> int:
+        exposure = self.team_exposure.get(team, self.max_team_exposure)
+        return math.floor(exposure * (num_lineups or self.num_lineups) + 1e-9)
+
+
+def build_portfolio(
+    players: pd.DataFrame,
+    site: str = "yahoo",
+    settings: PortfolioSettings | None = None,
+    selected_players: list[str] | None = None,
+    excluded_players: list[str] | None = None,
+    solver_config: SolverConfig | None = None,
+    max_workers: int | None = None,
+    formulation: str = "slot",
+) -> list[LineupResult]:
+    settings = settings or PortfolioSettings()
+    selected_players = list(selected_players or [])
+    excluded_players = list(excluded_players or [])
+    max_workers = max_workers or os.cpu_count() or 1
+
+    partitions = _core_partitions(players, settings, selected_players, excluded_players, max_workers)
+    jobs = [
+        (
+            players,
+            site,
+            settings,
+            selected_players + locks,
+            excluded_players + excludes,
+            solver_config,
+            quota,
+            formulation,
+        )
+        for locks, excludes, quota in partitions
+    ]
+
+    if max_workers <= 1 or len(jobs) <= 1:
+        partition_lineups = [_solve_partition(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+            partition_lineups = list(executor.map(_solve_partition, jobs))
+
+    # Partitions only see their share of each cap, so the merged set is re-checked against the
+    # global caps and distance rule, and any shortfall is filled by a final sequential pass.
+    tracker = _ExposureTracker(players, settings, uncapped=set(selected_players))
+    for lineup in sorted(
+        (lineup for lineups in partition_lineups for lineup in lineups),
+        key=lambda lineup: lineup.projected_points,
+        reverse=True,
+    ):
+        if len(tracker.lineups) < settings.num_lineups and tracker.accepts(lineup):
+            tracker.add(lineup)
+
+    if len(tracker.lineups) < settings.num_lineups:
+        lineup_model = build_lineup_model(
+            players,
+            site=site,
+            selected_players=selected_players,
+            excluded_players=excluded_players,
+            formulation=formulation,
+        )
+        _fill_lineups(lineup_model, tracker, settings.num_lineups, solver_config)
+
+    return sorted(tracker.lineups, key=lambda lineup: lineup.projected_points, reverse=True)
+
+
+def portfolio_upload_frame(lineups: list[LineupResult], players: pd.DataFrame, site: str = "yahoo") -> pd.DataFrame:
+    roster_slots = SITE_RULES[site]["roster_slots"]
+    player_ids = {}
+    if "ID" in players.columns:
+        player_ids = dict(players[["Player", "ID"]].dropna().itertuples(index=False, name=None))
+
+    rows = []
+    for lineup in lineups:
+        slot_players = dict(zip(lineup.lineup["RosterSlot"].astype(str), lineup.lineup["Player"]))
+        rows.append([player_ids.get(slot_players.get(slot), slot_players.get(slot)) for slot in roster_slots])
+
+    return pd.DataFrame(rows, columns=roster_slots)
+
+
+def portfolio_exposure(lineups: list[LineupResult]) -> pd.DataFrame:
+    if not lineups:
+        return pd.DataFrame(columns=["Player", "Tm", "Lineups", "Exposure"])
+
+    rostered = pd.concat([lineup.lineup[["Player", "Tm"]] for lineup in lineups], ignore_index=True)
+    exposure = rostered.groupby(["Player", "Tm"]).size().rename("Lineups").reset_index()
+    exposure["Exposure"] = (exposure["Lineups"] / len(lineups)).round(3)
+    return exposure.sort_values("Lineups", ascending=False).reset_index(drop=True)
+
+
+def _core_partitions(
+    players: pd.DataFrame,
+    settings: PortfolioSettings,
+    selected_players: list[str],
+    excluded_players: list[str],
+    num_partitions: int,
+) -> list[tuple[list[str], list[str], int]]:
+    if num_partitions <= 1:
+        return [([], [], settings.num_lineups)]
+
+    pool = players[~players["Player"].isin(set(selected_players) | set(excluded_players))]
+    if "Ineligible" in pool.columns:
+        pool = pool[~pool["Ineligible"].fillna(False).astype(bool)]
+    cores = (
+        pool.sort_values("FP", ascending=False)
+        .drop_duplicates(subset=["Player"])["Player"]
+        .head(num_partitions - 1)
+        .tolist()
+    )
+
+    # Partition i locks core i and excludes the earlier cores, so no two partitions can produce
+    # the same lineup; the last partition excludes every core player.
+    partitions = []
+    remaining = settings.num_lineups
+    share = math.ceil(settings.num_lineups / (len(cores) + 1))
+    for position, core in enumerate(cores):
+        quota = min(share, settings.player_cap(core), remaining)
+        if quota <= 0:
+            continue
+        partitions.append(([core], cores[:position], quota))
+        remaining -= quota
+
+    if remaining > 0:
+        partitions.append(([], cores, remaining))
+    return partitions
+
+
+def _solve_partition(job) -> list[LineupResult]:
+    players, site, settings, selected_players, excluded_players, solver_config, quota, formulation = job
+    lineup_model = build_lineup_model(
+        players,
+        site=site,
+        selected_players=selected_players,
+        excluded_players=excluded_players,
+        formulation=formulation,
+    )
+    tracker = _ExposureTracker(
+        players,
+        settings,
+        scale=quota / settings.num_lineups,
+        uncapped=set(selected_players),
+    )
+    _fill_lineups(lineup_model, tracker, quota, solver_config)
+    return tracker.lineups
+
+
+def _fill_lineups(
+    lineup_model: LineupModel,
+    tracker: "_ExposureTracker",
+    num_lineups: int,
+    solver_config: SolverConfig | None,
+) -> None:
+    from pulp import lpSum
+
+    model = lineup_model.model
+    roster_size = len(SITE_RULES[lineup_model.site]["roster_slots"])
+    min_unique = tracker.settings.min_unique
+
+    def forbid_overlap(lineup: LineupResult) -> None:
+        lineup_variables = [
+            variable
+            for player in lineup.lineup["Player"]
+            for variable in lineup_model.player_variables.get(player, [])
+        ]
+        constraint_name = f"Previous_Lineup_{len(model.constraints)}"
+        model.addConstraint(lpSum(lineup_variables) <= roster_size - max(1, min_unique), constraint_name)
+
+    def exclude_players(player_names: set[str]) -> None:
+        # Locked players are in every lineup by definition, so a cap never removes them.
+        for player_name in player_names - tracker.uncapped:
+            if player_name in lineup_model.player_variables:
+                constraint_name = f"Exposure_Cap_{len(model.constraints)}"
+                model.addConstraint(lpSum(lineup_model.player_variables[player_name]) == 0, constraint_name)
+
+    for lineup in tracker.lineups:
+        forbid_overlap(lineup)
+    exclude_players(tracker.capped_players())
+
+    while len(tracker.lineups) < num_lineups:
+        try:
+            lineup = solve_lineup_model(lineup_model, solver_config=solver_config)
+        except ValueError:
+            break
+
+        forbid_overlap(lineup)
+        if not tracker.accepts(lineup):
+            continue
+
+        newly_capped = tracker.add(lineup)
+        exclude_players(newly_capped)
+
+
+class _ExposureTracker:
+    def __init__(
+        self,
+        players: pd.DataFrame,
+        settings: PortfolioSettings,
+        scale: float = 1.0,
+        uncapped: set[str] | None = None,
+    ):
+        self.settings = settings
+        self.scale = scale
+        self.uncapped = uncapped or set()
+        self.player_teams = dict(players[["Player", "Tm"]].itertuples(index=False, name=None))
+        self.uncapped_teams = {self.player_teams[player] for player in self.uncapped if player in self.player_teams}
+        self.lineups: list[LineupResult] = []
+        self.player_counts: dict[str, int] = {}
+        self.team_counts: dict[str, int] = {}
+        self.player_sets: list[frozenset[str]] = []
+
+    def player_cap(self, player_name: str) -> int | float:
+        if player_name in self.uncapped:
+            return math.inf
+        return math.ceil(self.settings.player_cap(player_name) * self.scale)
+
+    def team_cap(self, team: str) -> int | float:
+        if team in self.uncapped_teams:
+            return math.inf
+        return math.ceil(self.settings.team_cap(team) * self.scale)
+
+    def accepts(self, lineup: LineupResult) -> bool:
+        lineup_players = frozenset(lineup.lineup["Player"])
+        if any(self.player_counts.get(player, 0) >= self.player_cap(player) for player in lineup_players):
+            return False
+        if any(self.team_counts.get(team, 0) >= self.team_cap(team) for team in set(lineup.lineup["Tm"])):
+            return False
+
+        roster_size = len(lineup_players)
+        return all(
+            roster_size - len(lineup_players & previous) >= self.settings.min_unique for previous in self.player_sets
+        )
+
+    def add(self, lineup: LineupResult) -> set[str]:
+        self.lineups.append(lineup)
+        self.player_sets.append(frozenset(lineup.lineup["Player"]))
+
+        newly_capped = set()
+        for player in lineup.lineup["Player"]:
+            self.player_counts[player] = self.player_counts.get(player, 0) + 1
+            if self.player_counts[player] >= self.player_cap(player):
+                newly_capped.add(player)
+
+        for team in set(lineup.lineup["Tm"]):
+            self.team_counts[team] = self.team_counts.get(team, 0) + 1
+            if self.team_counts[team] >= self.team_cap(team):
+                newly_capped.update(player for player, player_team in self.player_teams.items() if player_team == team)
+
+        return newly_capped
+
+    def capped_players(self) -> set[str]:
+        capped = {player for player, count in self.player_counts.items() if count >= self.player_cap(player)}
+        capped_teams = {team for team, count in self.team_counts.items() if count >= self.team_cap(team)}
+        capped.update(player for player, team in self.player_teams.items() if team in capped_teams)
+        return capped
@@ -0,0 +1,147 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from dfs_core import formalize_name, normalize_team_abbreviation
+from lineup_optimizer import SITE_RULES, LineupResult, SolverConfig, build_lineup
+
+
+@dataclass
+class Scenario:
+    name: str
+    select: list[str] = field(default_factory=list)
+    exclude: list[str] = field(default_factory=list)
+    exclude_teams: list[str] = field(default_factory=list)
+    exclude_games: list[str] = field(default_factory=list)
+
+
+def load_scenarios(path: str) -> list[Scenario]:
+    with open(path, encoding="utf-8") as handle:
+        if path.endswith(".json"):
+            raw = json.load(handle)
+        else:
+            import yaml
+
+            raw = yaml.safe_load(handle)
+
+    entries = raw.get("scenarios", []) if isinstance(raw, dict) else raw or []
+    scenarios = []
+    for position, entry in enumerate(entries, start=1):
+        name = str(entry["name"]).strip() if entry.get("name") is not None else f"Scenario {position}"
+        scenarios.append(
+            Scenario(
+                name=name,
+                select=[formalize_name(name) for name in entry.get("select") or []],
+                exclude=[formalize_name(name) for name in entry.get("exclude") or []],
+                exclude_teams=[normalize_team_abbreviation(team) for team in entry.get("exclude_teams") or []],
+                exclude_games=[normalize_team_abbreviation(team) for team in entry.get("exclude_games") or []],
+            )
+        )
+
+    if not scenarios:
+        raise ValueError(f"No scenarios found in {path}")
+    check_scenario_names(scenarios)
+    return scenarios
+
+
+def check_scenario_names(scenarios: list[Scenario]) -> None:
+    # Results are keyed by name, so a repeated name would silently replace another scenario's lineup.
+    names = [scenario.name for scenario in scenarios]
+    if any(not name.strip() for name in names):
+        raise ValueError("Scenario names must not be empty")
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate scenario names: {', '.join(duplicates)}")
+
+
+def scenario_exclusions(players: pd.DataFrame, scenario: Scenario) -> list[str]:
+    faded = players["Tm"].isin(scenario.exclude_teams + scenario.exclude_games)
+    if "Opponent" in players.columns:
+        faded |= players["Opponent"].isin(scenario.exclude_games)
+    return scenario.exclude + players.loc[faded, "Player"].tolist()
+
+
+def run_scenarios(
+    players: pd.DataFrame,
+    scenarios: list[Scenario],
+    site: str = "yahoo",
+    selected_players: list[str] | None = None,
+    excluded_players: list[str] | None = None,
+    solver_config: SolverConfig | None = None,
+    max_workers: int | None = None,
+    formulation: str = "slot",
+) -> dict[str, LineupResult | Exception]:
+    check_scenario_names(scenarios)
+    selected_players = selected_players or []
+    excluded_players = excluded_players or []
+    jobs = [
+        (
+            scenario.name,
+            selected_players + scenario.select,
+            excluded_players + scenario_exclusions(players, scenario),
+        )
+        for scenario in scenarios
+    ]
+
+    max_workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+    if max_workers <= 1:
+        _init_scenario_worker(players, site, solver_config, formulation)
+        return dict(_solve_scenario(job) for job in jobs)
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_scenario_worker,
+        initargs=(players, site, solver_config, formulation),
+    ) as executor:
+        return dict(executor.map(_solve_scenario, jobs))
+
+
+def compare_scenarios(results: dict[str, LineupResult | Exception], site: str = "yahoo") -> pd.DataFrame:
+    roster_slots = SITE_RULES[site]["roster_slots"]
+    comparison = {}
+
+    for name, result in results.items():
+        if isinstance(result, Exception):
+            comparison[name] = {slot: "" for slot in roster_slots} | {"Salary": "", "FP": "failed"}
+            continue
+
+        column = {
+            row["RosterSlot"]: f"{row['Player']} ({row['FP']:.1f})" for _, row in result.lineup.iterrows()
+        }
+        column["Salary"] = f"{result.total_salary:g}"
+        column["FP"] = f"{result.projected_points:.2f}"
+        comparison[name] = column
+
+    return pd.DataFrame(comparison, index=roster_slots + ["Salary", "FP"])
+
+
+_worker_state = {}
+
+
+def _init_scenario_worker(
+    players: pd.DataFrame,
+    site: str,
+    solver_config: SolverConfig | None,
+    formulation: str,
+) -> None:
+    _worker_state.update(players=players, site=site, solver_config=solver_config, formulation=formulation)
+
+
+def _solve_scenario(job: tuple[str, list[str], list[str]]) -> tuple[str, LineupResult | Exception]:
+    name, selected_players, excluded_players = job
+    try:
+        result = build_lineup(
+            _worker_state["players"],
+            site=_worker_state["site"],
+            lineup_name=name,
+            selected_players=selected_players,
+            excluded_players=excluded_players,
+            solver_config=_worker_state["solver_config"],
+            formulation=_worker_state["formulation"],
+        )
+    except Exception as exc:
+        return name, exc
+    return name, result
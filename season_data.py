@@ -1,14 +1,55 @@
 import argparse
+import csv
+import os
+import shutil
 import time
+from collections.abc import Iterable, Iterator
 from datetime import datetime
 
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
 
 
 BASE_SCHEDULE_URL = "https://www.basketball-reference.com/leagues/{}_games-{}.html"
 DEFAULT_MONTHS = ["october", "november", "december", "january", "february", "march", "april"]
+GAME_LOG_COLUMNS = [
+    "Player",
+    "TEAM",
+    "OPP_TEAM",
+    "team_final_score",
+    "opp_final_score",
+    "GAME_DATE",
+    "GAME_URL",
+    "MIN",
+    "PTS",
+    "3PM",
+    "TRB",
+    "AST",
+    "STL",
+    "BLK",
+    "TOV",
+    "USG",
+    "DNP",
+]
+COUNTING_STAT_COLUMNS = ["PTS", "3PM", "TRB", "AST", "STL", "BLK", "TOV"]
+GAME_LOG_SCHEMA = {
+    "Player": "category",
+    "TEAM": "category",
+    "OPP_TEAM": "category",
+    "team_final_score": "int16",
+    "opp_final_score": "int16",
+    "GAME_DATE": "datetime64[ns]",
+    "GAME_URL": "category",
+    "MIN": "float32",
+    "PTS": "int16",
+    "3PM": "int8",
+    "TRB": "int8",
+    "AST": "int8",
+    "STL": "int8",
+    "BLK": "int8",
+    "TOV": "int8",
+    "USG": "float32",
+    "DNP": "bool",
+}
 
 
 def scrape_season_game_data(
@@ -17,9 +58,16 @@ def scrape_season_game_data(
     request_delay: float = 3.0,
     max_games: int | None = None,
 ) -> pd.DataFrame:
+    game_urls = iter_schedule_game_urls(season_year, months=months)
+    games = iter_game_rows(game_urls, request_delay=request_delay, max_games=max_games)
+    return apply_game_log_schema(pd.DataFrame([row for game_rows in games for row in game_rows]))
+
+
+def iter_schedule_game_urls(season_year: str, months: list[str] | None = None) -> Iterator[str]:
+    import requests
+    from bs4 import BeautifulSoup
+
     months = months or DEFAULT_MONTHS
-    all_game_data = []
-    games_processed = 0
 
     for month in months:
         schedule_url = BASE_SCHEDULE_URL.format(season_year, month)
@@ -44,25 +92,170 @@ def scrape_season_game_data(
             if not box_link_tag:
                 continue
 
-            game_relative_url = box_link_tag.get("href")
-            game_url = "https://www.basketball-reference.com" + game_relative_url
-            time.sleep(request_delay)
+            yield "https://www.basketball-reference.com" + box_link_tag.get("href")
 
-            game_data = scrape_single_game(game_url)
-            if not game_data:
-                continue
 
-            all_game_data.extend(game_data)
-            games_processed += 1
-            print(f"Processed game: {game_url}")
+def iter_game_rows(
+    game_urls: Iterable[str],
+    request_delay: float = 3.0,
+    max_games: int | None = None,
+    skip_urls: set[str] | None = None,
+) -> Iterator[list[dict]]:
+    skip_urls = skip_urls or set()
+    games_processed = 0
+
+    for game_url in game_urls:
+        if max_games is not None and games_processed >= max_games:
+            return
+        if game_url in skip_urls:
+            continue
+
+        time.sleep(request_delay)
+        game_data = scrape_single_game(game_url)
+        if not game_data:
+            continue
+
+        games_processed += 1
+        print(f"Processed game: {game_url}")
+        yield game_data
+
+
+def write_game_rows(games: Iterable[list[dict]], output: str, batch_size: int = 500, append: bool = False) -> int:
+    writer = _ParquetPartWriter(output, append) if _is_parquet_output(output) else _CsvBatchWriter(output, append)
+    batch = []
+    rows_written = 0
+
+    for game_rows in games:
+        batch.extend(game_rows)
+        if len(batch) >= batch_size:
+            writer.write(batch)
+            rows_written += len(batch)
+            batch = []
+
+    if batch:
+        writer.write(batch)
+        rows_written += len(batch)
+
+    return rows_written
+
+
+def read_scraped_game_urls(output: str) -> set[str]:
+    if not os.path.exists(output):
+        return set()
+
+    if _is_parquet_output(output):
+        existing = pd.read_parquet(output, columns=["GAME_URL"])
+    else:
+        existing = pd.read_csv(output, usecols=["GAME_URL"])
+    return set(existing["GAME_URL"].dropna())
+
+
+def _is_parquet_output(output: str) -> bool:
+    return output.endswith(".parquet")
 
-            if max_games is not None and games_processed >= max_games:
-                return pd.DataFrame(all_game_data)
 
-    return pd.DataFrame(all_game_data)
+class _CsvBatchWriter:
+    def __init__(self, output: str, append: bool):
+        self.output = output
+        self.columns = GAME_LOG_COLUMNS
+        self.write_header = not (append and os.path.exists(output) and os.path.getsize(output) > 0)
+        if not append and os.path.exists(output):
+            os.remove(output)
+
+        # Older scrapes used a different column order, so appended rows follow the existing header.
+        if not self.write_header:
+            self.columns = _read_csv_header(output)
+            if set(GAME_LOG_COLUMNS) - set(self.columns) == {"DNP"}:
+                self.columns = _add_csv_dnp_column(output)
+            if set(self.columns) != set(GAME_LOG_COLUMNS):
+                raise ValueError(
+                    f"{output} has columns {', '.join(self.columns)}, expected {', '.join(GAME_LOG_COLUMNS)}; "
+                    "refusing to append"
+                )
+
+    def write(self, rows: list[dict]) -> None:
+        frame = pd.DataFrame(rows).reindex(columns=self.columns)
+        with open(self.output, "a", newline="", encoding="utf-8") as handle:
+            frame.to_csv(handle, index=False, header=self.write_header)
+            handle.flush()
+            os.fsync(handle.fileno())
+        self.write_header = False
+
+
+def _read_csv_header(path: str) -> list[str]:
+    with open(path, newline="", encoding="utf-8") as handle:
+        return next(csv.reader(handle), [])
+
+
+def _add_csv_dnp_column(path: str) -> list[str]:
+    # Scrapes from before the DNP flag are migrated in place so old and new rows share one header.
+    existing = pd.read_csv(path, dtype=str, keep_default_na=False)
+    existing["DNP"] = existing["MIN"].map(_parse_minutes) <= 0
+    temporary_path = f"{path}.tmp"
+    existing.to_csv(temporary_path, index=False)
+    os.replace(temporary_path, path)
+    return list(existing.columns)
+
+
+class _ParquetPartWriter:
+    def __init__(self, output: str, append: bool):
+        self.output = output
+        if not append and os.path.isdir(output):
+            shutil.rmtree(output)
+        os.makedirs(output, exist_ok=True)
+        part_names = sorted(name for name in os.listdir(output) if name.endswith(".parquet"))
+        self.part_number = len(part_names)
+        for part_name in part_names:
+            self._migrate_part(part_name)
+
+    def write(self, rows: list[dict]) -> None:
+        part_name = f"part-{self.part_number:05d}.parquet"
+        self._write_part(part_name, pd.DataFrame(rows))
+        self.part_number += 1
+
+    def _migrate_part(self, part_name: str) -> None:
+        # Parts written before the typed schema hold plain strings and no DNP column; they are
+        # rewritten so every part of the dataset shares one schema.
+        import pyarrow.parquet as pq
+
+        path = os.path.join(self.output, part_name)
+        schema = pq.read_schema(path)
+        if _parquet_types(schema) == _parquet_types(_game_log_parquet_schema()):
+            return
+        if not set(GAME_LOG_COLUMNS) - {"DNP"} <= set(schema.names) <= set(GAME_LOG_COLUMNS):
+            raise ValueError(f"{path} has columns {', '.join(schema.names)}; refusing to append")
+        existing = pd.read_parquet(path)
+        if "DNP" not in existing.columns:
+            existing["DNP"] = existing["MIN"].map(_parse_minutes) <= 0
+        self._write_part(part_name, existing)
+
+    def _write_part(self, part_name: str, frame: pd.DataFrame) -> None:
+        temporary_path = os.path.join(self.output, f".{part_name}.tmp")
+        _typed_parquet_frame(frame).to_parquet(temporary_path, index=False)
+        os.replace(temporary_path, os.path.join(self.output, part_name))
+
+
+def _typed_parquet_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    frame = apply_game_log_schema(frame.reindex(columns=GAME_LOG_COLUMNS))
+    category_columns = [column for column, dtype in GAME_LOG_SCHEMA.items() if dtype == "category"]
+    frame[category_columns] = frame[category_columns].astype("string")
+    return frame
+
+
+def _game_log_parquet_schema():
+    import pyarrow as pa
+
+    return pa.Schema.from_pandas(_typed_parquet_frame(pd.DataFrame(columns=GAME_LOG_COLUMNS)), preserve_index=False)
+
+
+def _parquet_types(schema) -> dict[str, str]:
+    return {field.name: str(field.type) for field in schema}
 
 
 def scrape_single_game(game_url: str) -> list[dict]:
+    import requests
+    from bs4 import BeautifulSoup
+
     response = requests.get(game_url, headers={"User-Agent": "Mozilla/5.0"}, timeout=30)
     if response.status_code != 200:
         print(f"Failed to get box score for {game_url}")
@@ -205,20 +398,103 @@ def _extract_team_player_rows(
             "tov": "TOV",
         }
 
+        stat["DNP"] = any(cell.get("data-stat") == "reason" for cell in cells)
+        stat["MIN"] = 0.0
+        for column in COUNTING_STAT_COLUMNS:
+            stat[column] = 0
+
         for cell in cells:
             data_stat = cell.get("data-stat")
-            if data_stat in stat_mapping:
-                stat[stat_mapping[data_stat]] = cell.get_text().strip()
+            if data_stat == "mp":
+                stat["MIN"] = _parse_minutes(cell.get_text())
+            elif data_stat in stat_mapping:
+                stat[stat_mapping[data_stat]] = _parse_int(cell.get_text())
 
         usage_value = team_advanced_usage.get(team_abbr, {}).get(stat["Player"])
-        if usage_value is not None:
-            stat["USG"] = usage_value
+        stat["USG"] = _parse_float(usage_value)
 
         rows.append(stat)
 
     return rows
 
 
+def apply_game_log_schema(frame: pd.DataFrame) -> pd.DataFrame:
+    typed = frame.copy()
+
+    for column, dtype in GAME_LOG_SCHEMA.items():
+        if column not in typed.columns:
+            continue
+
+        values = typed[column]
+        if column == "MIN":
+            if values.dtype == object or pd.api.types.is_string_dtype(values):
+                values = values.map(_parse_minutes)
+            typed[column] = pd.to_numeric(values, errors="coerce").fillna(0.0).astype(dtype)
+        elif column == "GAME_DATE":
+            typed[column] = pd.to_datetime(values, format="%m/%d/%Y", errors="coerce")
+        elif column == "DNP":
+            typed[column] = values.map(lambda value: str(value).strip().lower() in {"true", "1"}).astype(dtype)
+        elif dtype == "category":
+            typed[column] = values.astype("string").astype(dtype)
+        elif dtype.startswith("int"):
+            typed[column] = pd.to_numeric(values, errors="coerce").fillna(0).astype(dtype)
+        else:
+            typed[column] = pd.to_numeric(values, errors="coerce").astype(dtype)
+
+    if "DNP" not in typed.columns and "MIN" in typed.columns:
+        typed["DNP"] = typed["MIN"] <= 0
+
+    return typed
+
+
+def load_game_logs(path: str, columns: list[str] | None = None) -> pd.DataFrame:
+    if path.endswith(".parquet"):
+        game_logs = pd.read_parquet(path, columns=columns)
+    else:
+        game_logs = pd.read_csv(
+            path,
+            usecols=(lambda column: column in columns) if columns else None,
+            dtype={column: "string" for column, dtype in GAME_LOG_SCHEMA.items() if dtype == "category"},
+        )
+
+    return apply_game_log_schema(game_logs)
+
+
+def _parse_minutes(value) -> float:
+    if value is None:
+        return 0.0
+
+    text = str(value).strip()
+    if ":" in text:
+        minutes, _separator, seconds = text.partition(":")
+        try:
+            return round(int(minutes) + int(seconds) / 60.0, 2)
+        except ValueError:
+            return 0.0
+
+    try:
+        return float(text)
+    except ValueError:
+        return 0.0
+
+
+def _parse_int(value) -> int:
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        return 0
+
+
+def _parse_float(value) -> float | None:
+    if value is None:
+        return None
+
+    try:
+        return float(str(value).strip())
+    except ValueError:
+        return None
+
+
 def _parse_game_date(meta) -> str | None:
     if meta is None:
         return None
@@ -236,15 +512,26 @@ def _parse_game_date(meta) -> str | None:
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser(description="Scrape Basketball Reference NBA game logs into CSV")
+    parser = argparse.ArgumentParser(description="Scrape Basketball Reference NBA game logs into CSV or Parquet")
     parser.add_argument("--season", default="NBA_2025", help="Basketball Reference season id, for example NBA_2025")
-    parser.add_argument("--output", default="nba_season_game_stats.csv", help="Output CSV path")
+    parser.add_argument(
+        "--output",
+        default="nba_season_game_stats.csv",
+        help="Output CSV path, or a .parquet directory for columnar output",
+    )
     parser.add_argument("--max-games", type=int, default=None, help="Optional limit for testing")
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows buffered before each write")
+    parser.add_argument("--resume", action="store_true", help="Append to existing output and skip scraped games")
     args = parser.parse_args()
 
-    data = scrape_season_game_data(args.season, max_games=args.max_games)
-    data.to_csv(args.output, index=False)
-    print(f"Saved {len(data)} rows to {args.output}")
+    skip_urls = read_scraped_game_urls(args.output) if args.resume else set()
+    games = iter_game_rows(
+        iter_schedule_game_urls(args.season),
+        max_games=args.max_games,
+        skip_urls=skip_urls,
+    )
+    rows_written = write_game_rows(games, args.output, batch_size=args.batch_size, append=args.resume)
+    print(f"Saved {rows_written} rows to {args.output}")
     return 0
 
 
@@ -0,0 +1,182 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from lineup_optimizer import LineupResult, SolverConfig, build_lineup, build_lineup_model, solve_lineup_model
+
+
+def lineup_sensitivity(
+    players: pd.DataFrame,
+    site: str = "yahoo",
+    selected_players: list[str] | None = None,
+    excluded_players: list[str] | None = None,
+    solver_config: SolverConfig | None = None,
+    base_result: LineupResult | None = None,
+    max_workers: int | None = None,
+    formulation: str = "player",
+) -> pd.DataFrame:
+    selected_players = list(selected_players or [])
+    excluded_players = list(excluded_players or [])
+    base_result = base_result or build_lineup(
+        players,
+        site=site,
+        selected_players=selected_players,
+        excluded_players=excluded_players,
+        solver_config=solver_config,
+        formulation=formulation,
+    )
+    base_points = _objective(base_result)
+    rostered = set(base_result.lineup["Player"])
+
+    candidates = players.drop_duplicates(subset=["Player"])
+    if "Ineligible" in candidates.columns:
+        candidates = candidates[~candidates["Ineligible"].fillna(False).astype(bool)]
+    candidates = candidates[~candidates["Player"].isin(set(excluded_players) | set(selected_players))]
+
+    # Forcing a bench player in (or a rostered player out) and re-solving gives the best lineup
+    # under that constraint; the objective gap is exactly the FP change that flips the decision.
+    jobs = [(player_name, player_name in rostered) for player_name in candidates["Player"]]
+    worker_args = (players, site, selected_players, excluded_players, solver_config, formulation)
+
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers <= 1 or len(jobs) <= 1:
+        _init_sensitivity_worker(*worker_args)
+        constrained_points = [_solve_constrained(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_sensitivity_worker,
+            initargs=worker_args,
+        ) as executor:
+            chunksize = max(1, len(jobs) // (max_workers * 4))
+            constrained_points = list(executor.map(_solve_constrained, jobs, chunksize=chunksize))
+
+    report = candidates[["Player", "Tm", "Positions", "Salary", "FP"]].copy().reset_index(drop=True)
+    report["Positions"] = report["Positions"].map(
+        lambda positions: "/".join(positions) if isinstance(positions, list) else positions
+    )
+    report["Rostered"] = report["Player"].isin(rostered)
+    gap = (base_points - pd.Series(constrained_points, dtype=float)).clip(lower=0.0).round(2)
+    report["FPToEnter"] = gap.where(~report["Rostered"])
+    report["FPToExit"] = gap.where(report["Rostered"])
+    report["TargetFP"] = (report["FP"] + report["FPToEnter"].fillna(-report["FPToExit"])).round(2)
+
+    return report.sort_values(
+        ["Rostered", "FPToExit", "FPToEnter"],
+        ascending=[False, True, True],
+        na_position="last",
+    ).reset_index(drop=True)
+
+
+_worker_state = {}
+
+
+def _init_sensitivity_worker(
+    players: pd.DataFrame,
+    site: str,
+    selected_players: list[str],
+    excluded_players: list[str],
+    solver_config: SolverConfig | None,
+    formulation: str,
+) -> None:
+    # Each worker builds the lineup model once and toggles a single constraint per player.
+    lineup_model = build_lineup_model(
+        players,
+        site=site,
+        selected_players=selected_players,
+        excluded_players=excluded_players,
+        formulation=formulation,
+    )
+    _worker_state["lineup_model"] = lineup_model
+    _worker_state["solver_config"] = solver_config
+    _worker_state["highs"] = None
+    if solver_config is not None and solver_config.backend.lower() == "highs":
+        _worker_state["highs"] = _InProcessHighs(lineup_model, solver_config)
+
+
+def _solve_constrained(job: tuple[str, bool]) -> float | None:
+    from pulp import lpSum
+
+    player_name, rostered = job
+    lineup_model = _worker_state["lineup_model"]
+    if _worker_state["highs"] is not None:
+        return _worker_state["highs"].solve(lineup_model.player_variables[player_name], 0 if rostered else 1)
+
+    model = lineup_model.model
+    model += lpSum(lineup_model.player_variables[player_name]) == (0 if rostered else 1), "Sensitivity_Player"
+
+    try:
+        result = solve_lineup_model(lineup_model, solver_config=_worker_state["solver_config"])
+    except ValueError:
+        return None
+    finally:
+        del model.constraints["Sensitivity_Player"]
+    return _objective(result)
+
+
+class _InProcessHighs:
+    """The worker's lineup model loaded once into HiGHS, re-solved with one row added per player."""
+
+    def __init__(self, lineup_model, solver_config: SolverConfig):
+        import highspy
+
+        self.highspy = highspy
+        self.highs = highspy.Highs()
+        self.highs.setOptionValue("output_flag", solver_config.msg)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "lineup.mps")
+            lineup_model.model.writeMPS(path)
+            self.highs.readModel(path)
+
+        self.columns = {name: index for index, name in enumerate(self.highs.getLp().col_names_)}
+        self.highs.changeObjectiveSense(highspy.ObjSense.kMaximize)
+        for variable, coefficient in lineup_model.model.objective.items():
+            self.highs.changeColCost(self.columns[variable.name], coefficient)
+        self.costs = np.array(self.highs.getLp().col_cost_)
+
+        for option, value in {
+            "time_limit": solver_config.time_limit,
+            "threads": solver_config.threads,
+            "mip_rel_gap": solver_config.gap,
+        }.items():
+            if value is not None:
+                self.highs.setOptionValue(option, value)
+        self.solutions = []
+
+    def solve(self, variables: list, player_count: int) -> float | None:
+        columns = np.array([self.columns[variable.name] for variable in variables], dtype=np.int32)
+        row = self.highs.getNumRow()
+        self.highs.addRow(player_count, player_count, len(columns), columns, np.ones(len(columns)))
+
+        # The best lineup found so far that already meets this constraint is a valid starting
+        # solution, and its points a cutoff below which no branch needs exploring.
+        incumbents = [values for values in self.solutions if round(values[columns].sum()) == player_count]
+        if incumbents:
+            incumbent = max(incumbents, key=lambda values: self.costs @ values)
+            solution = self.highspy.HighsSolution()
+            solution.col_value = list(incumbent)
+            solution.value_valid = True
+            self.highs.setSolution(solution)
+            # HiGHS takes the cutoff in its minimization sense, hence the sign.
+            self.highs.setOptionValue("objective_bound", 1e-4 - float(self.costs @ incumbent))
+        else:
+            self.highs.setOptionValue("objective_bound", self.highspy.kHighsInf)
+
+        try:
+            self.highs.run()
+            if self.highs.getModelStatus() != self.highspy.HighsModelStatus.kOptimal:
+                return None
+            values = np.round(self.highs.getSolution().col_value)
+            self.solutions.append(values)
+            return float(self.highs.getInfo().objective_function_value)
+        finally:
+            self.highs.deleteRows(1, np.array([row], dtype=np.int32))
+
+
+def _objective(result: LineupResult) -> float:
+    if result.solve_stats is not None and result.solve_stats.objective is not None:
+        return float(result.solve_stats.objective)
+    return float(result.lineup["FP"].sum())
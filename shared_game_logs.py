@@ -0,0 +1,248 @@
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from dfs_core import cache_path
+from season_data import GAME_LOG_SCHEMA, load_game_logs
+
+SHARED_GAME_LOG_VERSION = 1
+CURRENT_POINTER = "CURRENT"
+# Versions and source directories newer than this are never removed, so a publisher that is
+# about to swap the pointer, or a reader that is attaching, cannot lose its files.
+PUBLISH_GRACE_SECONDS = 60
+STALE_STAGING_SECONDS = 3600
+MAX_SHARED_SOURCES = 4
+
+
+@dataclass
+class SharedGameLogs:
+    """Read-only game-log columns memory-mapped from a published directory."""
+
+    directory: str
+    columns: dict[str, np.ndarray]
+    categories: dict[str, list[str]]
+    player_offsets: np.ndarray
+    date_values: np.ndarray
+    date_offsets: np.ndarray
+    date_order: np.ndarray
+
+    def __post_init__(self):
+        self.player_codes = {name: code for code, name in enumerate(self.categories["Player"])}
+
+    def __len__(self) -> int:
+        return int(self.player_offsets[-1]) if len(self.player_offsets) else 0
+
+    @property
+    def players(self) -> list[str]:
+        return self.categories["Player"]
+
+    def player_slice(self, player: str) -> slice:
+        code = self.player_codes.get(player)
+        if code is None:
+            return slice(0, 0)
+        return slice(int(self.player_offsets[code]), int(self.player_offsets[code + 1]))
+
+    def date_rows(self, start=None, end=None) -> np.ndarray:
+        low = 0 if start is None else np.searchsorted(self.date_values, np.datetime64(pd.Timestamp(start)), "left")
+        high = (
+            len(self.date_values)
+            if end is None
+            else np.searchsorted(self.date_values, np.datetime64(pd.Timestamp(end)), "right")
+        )
+        return self.date_order[self.date_offsets[low] : self.date_offsets[high]]
+
+    def column(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def player_games(self, player: str, columns: list[str] | None = None) -> pd.DataFrame:
+        return self.to_frame(columns, rows=self.player_slice(player))
+
+    def to_frame(self, columns: list[str] | None = None, rows=None) -> pd.DataFrame:
+        rows = slice(None) if rows is None else rows
+        data = {}
+        for name in columns or list(self.columns):
+            values = self.columns[name][rows]
+            if name in self.categories:
+                values = pd.Categorical.from_codes(values, categories=self.categories[name])
+            data[name] = values
+        return pd.DataFrame(data, copy=False)
+
+
+def publish_game_logs(path: str, directory: str | None = None, refresh: bool = False) -> str:
+    shared_root = None
+    if directory is None:
+        directory = cache_path("shared_game_logs", _source_fingerprint(path))
+        shared_root = os.path.dirname(directory)
+    if not refresh and _current_version(directory) is not None:
+        os.utime(os.path.join(directory, CURRENT_POINTER))
+        return directory
+
+    game_logs = load_game_logs(path).dropna(subset=["Player", "GAME_DATE"])
+    player_codes = game_logs["Player"].cat.remove_unused_categories().cat.codes.to_numpy()
+    game_dates = game_logs["GAME_DATE"].to_numpy()
+
+    # Rows are stored grouped by player and ordered by date, so one player's games are a
+    # contiguous slice; a second permutation orders all rows by date for window lookups.
+    order = np.lexsort((game_dates, player_codes))
+    game_logs = game_logs.iloc[order].reset_index(drop=True)
+    game_logs["Player"] = game_logs["Player"].cat.remove_unused_categories()
+    player_counts = np.bincount(game_logs["Player"].cat.codes, minlength=len(game_logs["Player"].cat.categories))
+    player_offsets = np.concatenate([[0], np.cumsum(player_counts)]).astype(np.int64)
+
+    date_order = np.argsort(game_logs["GAME_DATE"].to_numpy(), kind="stable").astype(np.int64)
+    date_values, date_counts = np.unique(game_logs["GAME_DATE"].to_numpy(), return_counts=True)
+    date_offsets = np.concatenate([[0], np.cumsum(date_counts)]).astype(np.int64)
+
+    # Each publish writes a new version directory and then swaps the CURRENT pointer file with
+    # os.replace, so readers always find either the old or the new copy and never a partial one.
+    os.makedirs(directory, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix="version-", dir=directory)
+    try:
+        categories = {}
+        for column in game_logs.columns:
+            values = game_logs[column]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                categories[column] = [str(category) for category in values.cat.categories]
+                values = values.cat.codes
+            np.save(os.path.join(staging, f"{_file_name(column)}.npy"), values.to_numpy())
+
+        for name, values in {
+            "_player_offsets": player_offsets,
+            "_date_values": date_values,
+            "_date_offsets": date_offsets,
+            "_date_order": date_order,
+        }.items():
+            np.save(os.path.join(staging, f"{name}.npy"), values)
+
+        meta = {
+            "version": SHARED_GAME_LOG_VERSION,
+            "source": os.path.abspath(path),
+            "rows": len(game_logs),
+            "columns": list(game_logs.columns),
+            "categories": categories,
+        }
+        with open(os.path.join(staging, "meta.json"), "w", encoding="utf-8") as handle:
+            json.dump(meta, handle)
+
+        handle, pointer_staging = tempfile.mkstemp(prefix=f".{CURRENT_POINTER}-", suffix=".tmp", dir=directory)
+        with os.fdopen(handle, "w", encoding="utf-8") as pointer:
+            pointer.write(os.path.basename(staging))
+        os.replace(pointer_staging, os.path.join(directory, CURRENT_POINTER))
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    _remove_old_versions(directory, keep=os.path.basename(staging))
+    if shared_root is not None:
+        _remove_old_sources(shared_root, keep=directory)
+    return directory
+
+
+def _remove_old_versions(directory: str, keep: str) -> None:
+    current = _current_version(directory) or keep
+    current_published = os.path.getmtime(os.path.join(directory, current, "meta.json"))
+    now = time.time()
+    for name in os.listdir(directory):
+        entry = os.path.join(directory, name)
+        if not name.startswith("version-") or name in {current, keep}:
+            continue
+        # meta.json is written last, so a version without one is another publisher's staging.
+        meta_path = os.path.join(entry, "meta.json")
+        if os.path.exists(meta_path):
+            published = os.path.getmtime(meta_path)
+            removable = published < current_published and now - published > PUBLISH_GRACE_SECONDS
+        else:
+            removable = now - os.path.getmtime(entry) > STALE_STAGING_SECONDS
+        if removable:
+            shutil.rmtree(entry, ignore_errors=True)
+
+
+def _remove_old_sources(shared_root: str, keep: str) -> None:
+    # Every change to a source file publishes under a new fingerprint, so only the most
+    # recently used fingerprints are kept.
+    def last_used(entry: str) -> float:
+        pointer_path = os.path.join(entry, CURRENT_POINTER)
+        return os.path.getmtime(pointer_path if os.path.exists(pointer_path) else entry)
+
+    entries = [os.path.join(shared_root, name) for name in os.listdir(shared_root)]
+    entries = sorted((entry for entry in entries if os.path.isdir(entry)), key=last_used, reverse=True)
+    now = time.time()
+    for entry in entries[MAX_SHARED_SOURCES:]:
+        if os.path.abspath(entry) != os.path.abspath(keep) and now - last_used(entry) > PUBLISH_GRACE_SECONDS:
+            shutil.rmtree(entry, ignore_errors=True)
+
+
+_attached: dict[str, SharedGameLogs] = {}
+
+
+def attach_game_logs(directory: str) -> SharedGameLogs:
+    version = _current_version(directory)
+    if version is None:
+        raise FileNotFoundError(f"No published game logs in {directory}")
+
+    directory = os.path.join(os.path.abspath(directory), version)
+    if directory in _attached:
+        return _attached[directory]
+
+    with open(os.path.join(directory, "meta.json"), encoding="utf-8") as handle:
+        meta = json.load(handle)
+    if meta.get("version") != SHARED_GAME_LOG_VERSION:
+        raise ValueError(f"Unsupported shared game log version in {directory}")
+
+    def load(name: str) -> np.ndarray:
+        return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+
+    shared = SharedGameLogs(
+        directory=directory,
+        columns={column: load(_file_name(column)) for column in meta["columns"]},
+        categories=meta["categories"],
+        player_offsets=load("_player_offsets"),
+        date_values=load("_date_values"),
+        date_offsets=load("_date_offsets"),
+        date_order=load("_date_order"),
+    )
+    _attached[directory] = shared
+    return shared
+
+
+def _current_version(directory: str) -> str | None:
+    try:
+        with open(os.path.join(directory, CURRENT_POINTER), encoding="utf-8") as handle:
+            version = handle.read().strip()
+    except OSError:
+        return None
+    return version if os.path.exists(os.path.join(directory, version, "meta.json")) else None
+
+
+def _file_name(column: str) -> str:
+    return "col_" + "".join(character if character.isalnum() else "_" for character in column)
+
+
+def _source_fingerprint(path: str) -> str:
+    if os.path.isdir(path):
+        files = sorted(os.path.join(root, name) for root, _dirs, names in os.walk(path) for name in names)
+    else:
+        files = [path]
+
+    digest = hashlib.sha256(os.path.abspath(path).encode("utf-8"))
+    digest.update(json.dumps(GAME_LOG_SCHEMA, sort_keys=True).encode("utf-8"))
+    for file in files:
+        stat = os.stat(file)
+        digest.update(f"{file}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python shared_game_logs.py GAME_LOG_FILE")
+        sys.exit(1)
+    shared = attach_game_logs(publish_game_logs(sys.argv[1], refresh="--refresh" in sys.argv))
+    print(f"Published {len(shared)} rows for {len(shared.players)} players to {shared.directory}")
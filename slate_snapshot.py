@@ -0,0 +1,155 @@
+import io
+import json
+import zipfile
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from dfs_core import ContestData
+
+SNAPSHOT_VERSION = 1
+PLAYER_KEY = "Player"
+
+
+@dataclass
+class SlateSnapshot:
+    contest_data: ContestData
+    player_stats: pd.DataFrame
+    dvp_data: dict[str, pd.DataFrame]
+    meta: dict = field(default_factory=dict)
+    team_context: pd.DataFrame | None = None
+
+
+def save_snapshot(
+    path: str,
+    contest_data: ContestData,
+    player_stats: pd.DataFrame,
+    dvp_data: dict[str, pd.DataFrame],
+    team_context: pd.DataFrame | None = None,
+    **meta,
+) -> str:
+    snapshot_meta = {
+        "version": SNAPSHOT_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "site": contest_data.site,
+        "contest_id": contest_data.contest_id,
+        "csv": contest_data.csv,
+        "team_opponents": contest_data.team_opponents,
+        **meta,
+    }
+
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as bundle:
+        bundle.writestr("meta.json", json.dumps(snapshot_meta, default=str))
+        bundle.writestr("contest.parquet", _frame_to_parquet(_contest_players_frame(contest_data)))
+        bundle.writestr("stats.parquet", _frame_to_parquet(player_stats.reset_index(drop=True)))
+        bundle.writestr("dvp.parquet", _frame_to_parquet(_dvp_to_frame(dvp_data)))
+        if team_context is not None:
+            bundle.writestr("team_context.parquet", _frame_to_parquet(team_context.reset_index(drop=True)))
+
+    return path
+
+
+def load_snapshot(path: str) -> SlateSnapshot:
+    with zipfile.ZipFile(path) as bundle:
+        meta = json.loads(bundle.read("meta.json"))
+        if meta.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {meta.get('version')}")
+
+        contest_players = _parquet_to_frame(bundle.read("contest.parquet"))
+        player_stats = _parquet_to_frame(bundle.read("stats.parquet"))
+        dvp_frame = _parquet_to_frame(bundle.read("dvp.parquet"))
+        team_context = None
+        if "team_context.parquet" in bundle.namelist():
+            team_context = _parquet_to_frame(bundle.read("team_context.parquet"))
+
+    contest_data = ContestData(
+        site=meta["site"],
+        contest_id=meta.get("contest_id"),
+        csv=meta.get("csv"),
+        team_opponents=meta.get("team_opponents", {}),
+    )
+    for field_name in _player_field_names(contest_data):
+        if field_name not in contest_players.columns:
+            continue
+        values = contest_players[[PLAYER_KEY, field_name]].dropna()
+        setattr(contest_data, field_name, dict(zip(values[PLAYER_KEY], values[field_name].map(_to_python))))
+
+    return SlateSnapshot(
+        contest_data=contest_data,
+        player_stats=player_stats,
+        dvp_data=_frame_to_dvp(dvp_frame),
+        meta=meta,
+        team_context=team_context,
+    )
+
+
+def _player_field_names(contest_data: ContestData) -> list[str]:
+    return [
+        contest_field.name
+        for contest_field in fields(contest_data)
+        if contest_field.name != "team_opponents" and isinstance(getattr(contest_data, contest_field.name), dict)
+    ]
+
+
+def _contest_players_frame(contest_data: ContestData) -> pd.DataFrame:
+    columns = {
+        field_name: pd.Series(getattr(contest_data, field_name), dtype=object)
+        for field_name in _player_field_names(contest_data)
+    }
+    players = pd.DataFrame(columns)
+    players.index.name = PLAYER_KEY
+    return players.reset_index()
+
+
+def _dvp_to_frame(dvp_data: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    frames = []
+    for position, frame in dvp_data.items():
+        position_frame = frame.copy()
+        position_frame.index = position_frame.index.rename("Team")
+        position_frame = position_frame.reset_index()
+        position_frame.insert(0, "Position", position)
+        frames.append(position_frame)
+
+    if not frames:
+        return pd.DataFrame(columns=["Position", "Team"])
+
+    dvp_frame = pd.concat(frames, ignore_index=True)
+    value_columns = [column for column in dvp_frame.columns if column not in {"Position", "Team"}]
+    dvp_frame[value_columns] = dvp_frame[value_columns].astype(object).where(dvp_frame[value_columns].notna(), None)
+    dvp_frame[value_columns] = dvp_frame[value_columns].map(lambda value: None if value is None else str(value))
+    dvp_frame.columns = [str(column) for column in dvp_frame.columns]
+    return dvp_frame
+
+
+def _frame_to_dvp(dvp_frame: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    dvp_data = {}
+    for position, frame in dvp_frame.groupby("Position", sort=False):
+        output = frame.drop(columns=["Position"]).set_index("Team").dropna(axis=1, how="all")
+        dvp_data[position] = output.astype(object).where(output.notna(), None)
+    return dvp_data
+
+
+def _frame_to_parquet(frame: pd.DataFrame) -> bytes:
+    buffer = io.BytesIO()
+    frame.to_parquet(buffer, index=False, compression="zstd")
+    return buffer.getvalue()
+
+
+def _parquet_to_frame(payload: bytes) -> pd.DataFrame:
+    frame = pd.read_parquet(io.BytesIO(payload))
+    for column in frame.columns:
+        if frame[column].dtype == object:
+            frame[column] = frame[column].map(_to_python)
+    return frame
+
+
+def _to_python(value):
+    if isinstance(value, np.ndarray):
+        return [_to_python(item) for item in value.tolist()]
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
@@ -0,0 +1,164 @@
+import argparse
+import random
+import sys
+
+import pandas as pd
+
+from lineup_optimizer import LINEUP_FORMULATIONS, SITE_RULES, SolverConfig, available_solver_backends, build_lineup
+
+POSITION_WEIGHTS = [
+    (["PG"], 0.14),
+    (["SG"], 0.12),
+    (["SF"], 0.11),
+    (["PF"], 0.11),
+    (["C"], 0.14),
+    (["PG", "SG"], 0.10),
+    (["SG", "SF"], 0.09),
+    (["SF", "PF"], 0.10),
+    (["PF", "C"], 0.09),
+]
+
+SALARY_RANGES = {
+    "yahoo": (10, 60, 1),
+    "dk": (3000, 12000, 100),
+}
+
+
+def make_synthetic_slate(site: str = "yahoo", num_players: int = 150, seed: int = 0) -> pd.DataFrame:
+    rng = random.Random(seed)
+    low, high, step = SALARY_RANGES[site]
+    position_choices = [positions for positions, _weight in POSITION_WEIGHTS]
+    position_weights = [weight for _positions, weight in POSITION_WEIGHTS]
+    num_teams = max(2, min(30, num_players // 12))
+
+    rows = []
+    for index in range(num_players):
+        salary = rng.randrange(low, high + step, step)
+        value_per_dollar = rng.uniform(4.0, 6.5) / (high / 10.0)
+        rows.append(
+            {
+                "Player": f"Player {index}",
+                "Tm": f"T{index % num_teams:02d}",
+                "Positions": rng.choices(position_choices, weights=position_weights)[0],
+                "Salary": salary,
+                "FP": round(max(0.0, salary * value_per_dollar + rng.gauss(0.0, 4.0)), 2),
+                "Ineligible": rng.random() < 0.05,
+            }
+        )
+
+    return pd.DataFrame(rows)
+
+
+def benchmark_solvers(
+    sites: list[str],
+    slate_sizes: list[int],
+    backends: list[str],
+    repeats: int = 3,
+    time_limit: float | None = None,
+    threads: int | None = None,
+    gap: float | None = None,
+    formulations: list[str] | None = None,
+) -> pd.DataFrame:
+    formulations = formulations or ["slot"]
+    results = []
+
+    for site in sites:
+        for slate_size in slate_sizes:
+            for repeat in range(repeats):
+                slate = make_synthetic_slate(site, slate_size, seed=repeat)
+                for backend in backends:
+                    config = SolverConfig(backend=backend, time_limit=time_limit, threads=threads, gap=gap)
+                    for formulation in formulations:
+                        try:
+                            lineup_result = build_lineup(
+                                slate,
+                                site=site,
+                                solver_config=config,
+                                formulation=formulation,
+                            )
+                        except ValueError as exc:
+                            print(f"{backend}/{formulation} failed on {site}/{slate_size}/{repeat}: {exc}")
+                            continue
+
+                        stats = lineup_result.solve_stats
+                        results.append(
+                            {
+                                "Site": site,
+                                "Players": slate_size,
+                                "Seed": repeat,
+                                "Backend": backend,
+                                "Formulation": formulation,
+                                "Seconds": stats.solve_seconds,
+                                "Objective": round(stats.objective or 0.0, 2),
+                                "Variables": stats.variables,
+                                "Constraints": stats.constraints,
+                                "Status": stats.solution_status,
+                            }
+                        )
+
+    return pd.DataFrame(results)
+
+
+def summarize_benchmark(results: pd.DataFrame) -> pd.DataFrame:
+    if results.empty:
+        return results
+
+    if "Formulation" not in results.columns:
+        results = results.assign(Formulation="slot")
+
+    summary = (
+        results.groupby(["Site", "Players", "Backend", "Formulation"])
+        .agg(
+            MeanSeconds=("Seconds", "mean"),
+            MaxSeconds=("Seconds", "max"),
+            Objective=("Objective", "mean"),
+            Variables=("Variables", "mean"),
+        )
+        .reset_index()
+    )
+    fastest_rows = summary.loc[summary.groupby(["Site", "Players"])["MeanSeconds"].idxmin()]
+    fastest = fastest_rows[["Site", "Players"]].assign(
+        Fastest=fastest_rows["Backend"] + "/" + fastest_rows["Formulation"]
+    )
+    return summary.merge(fastest, on=["Site", "Players"]).round(4)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark lineup solver backends on synthetic slates")
+    parser.add_argument("--sites", nargs="*", choices=sorted(SITE_RULES), default=sorted(SITE_RULES))
+    parser.add_argument("--sizes", nargs="*", type=int, default=[60, 150, 300], help="Player pool sizes")
+    parser.add_argument("--backends", nargs="*", default=None, help="Solver backends, defaults to all available")
+    parser.add_argument("--repeats", type=int, default=3, help="Synthetic slates per site and size")
+    parser.add_argument("--time-limit", type=float, default=None, help="Per-solve time limit in seconds")
+    parser.add_argument("--threads", type=int, default=None, help="Solver thread count")
+    parser.add_argument("--gap", type=float, default=None, help="Relative MIP gap")
+    parser.add_argument(
+        "--formulations",
+        nargs="*",
+        choices=LINEUP_FORMULATIONS,
+        default=LINEUP_FORMULATIONS,
+        help="Lineup model formulations to compare",
+    )
+    args = parser.parse_args()
+
+    backends = args.backends or available_solver_backends()
+    results = benchmark_solvers(
+        args.sites,
+        args.sizes,
+        backends,
+        repeats=args.repeats,
+        time_limit=args.time_limit,
+        threads=args.threads,
+        gap=args.gap,
+        formulations=args.formulations,
+    )
+    if results.empty:
+        print("No benchmark results.")
+        return 1
+
+    print(summarize_benchmark(results).to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+DEFAULT_MODULES = ["yahoo_dfs_optimizer", "data_providers", "lineup_optimizer"]
+WATCHED_PACKAGES = ["pandas", "pulp", "selenium", "bs4", "requests", "pyarrow"]
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def measure_import_time(module: str) -> list[dict]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=REPO_DIR,
+    )
+
+    records = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        record = _parse_importtime_line(line)
+        if record is not None:
+            records.append(record)
+    return records
+
+
+def _parse_importtime_line(line: str) -> dict | None:
+    try:
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+    except ValueError:
+        return None
+
+    return {
+        "module": name.strip(),
+        "depth": (len(name) - len(name.lstrip())) // 2,
+        "self_ms": int(self_us) / 1000.0,
+        "cumulative_ms": int(cumulative_us) / 1000.0,
+    }
+
+
+def measure_command_time(command: list[str], repeats: int = 5) -> list[float]:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        # A failing command would time its error exit, so any failure aborts the measurement.
+        subprocess.run(command, capture_output=True, check=True, cwd=REPO_DIR)
+        timings.append((time.perf_counter() - started) * 1000.0)
+    return timings
+
+
+def report_module(module: str, top: int = 10) -> None:
+    records = measure_import_time(module)
+    total = next((record for record in reversed(records) if record["module"] == module), None)
+    loaded = {record["module"] for record in records}
+
+    print(f"import {module}: {total['cumulative_ms']:.1f} ms" if total else f"import {module}: not measured")
+    print("  heavy packages loaded: " + (", ".join(name for name in WATCHED_PACKAGES if name in loaded) or "none"))
+    for record in sorted(records, key=lambda item: item["cumulative_ms"], reverse=True)[1 : top + 1]:
+        print(f"  {record['cumulative_ms']:8.1f} ms  {record['module']}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Report import and startup time of the optimizer modules")
+    parser.add_argument("--modules", nargs="*", default=DEFAULT_MODULES, help="Modules to import under -X importtime")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list per module")
+    parser.add_argument("--repeats", type=int, default=5, help="Runs of the CLI --help startup check")
+    args = parser.parse_args()
+
+    for module in args.modules:
+        report_module(module, top=args.top)
+
+    timings = measure_command_time([sys.executable, os.path.join(REPO_DIR, "yahoo_dfs_optimizer.py"), "--help"], repeats=args.repeats)
+    print(
+        f"yahoo_dfs_optimizer.py --help: median {statistics.median(timings):.1f} ms, "
+        f"min {min(timings):.1f} ms over {len(timings)} runs"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,27 @@
+import os
+
+import pandas as pd
+
+from draftkings import SALARY_COLUMNS, recorded_client, serve_recorded_responses
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "draftkings")
+
+
+def test_recorded_responses_produce_salary_csv(tmp_path):
+    server, base_url = serve_recorded_responses(FIXTURES)
+    try:
+        client = recorded_client(base_url, cache_max_age=0)
+        assert [group["DraftGroupId"] for group in client.get_draft_groups()] == [111, 222]
+        assert client.find_main_draft_group()["DraftGroupId"] == 222
+
+        path = client.download_salaries(str(tmp_path / "DKSalaries.csv"))
+    finally:
+        server.shutdown()
+
+    salaries = pd.read_csv(path, keep_default_na=False)
+    assert list(salaries.columns) == SALARY_COLUMNS
+    assert list(salaries["Name"]) == ["Jalen Brunson", "Jayson Tatum", "Mitchell Robinson"]
+    assert list(salaries["Roster Position"]) == ["PG/G/UTIL", "SF/PF/F/UTIL", "C/UTIL"]
+    assert list(salaries["Injury Status"]) == ["", "Q", "O"]
+    assert salaries.loc[0, "Name + ID"] == "Jalen Brunson (3001)"
+    assert salaries.loc[0, "Game Info"] == "BOS@NY 01/15/2025 07:30PM ET"
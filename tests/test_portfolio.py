@@ -0,0 +1,36 @@
+import pytest
+
+from portfolio import PortfolioSettings, build_portfolio, portfolio_exposure
+from solver_benchmark import make_synthetic_slate
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_locked_player_stays_in_every_lineup_under_an_exposure_cap(max_workers):
+    players = make_synthetic_slate("dk", 60, seed=1)
+    locked = players.loc[~players["Ineligible"]].sort_values("FP")["Player"].iloc[0]
+    settings = PortfolioSettings(num_lineups=10, max_exposure=0.4)
+
+    lineups = build_portfolio(
+        players,
+        site="dk",
+        settings=settings,
+        selected_players=[locked],
+        max_workers=max_workers,
+        formulation="player",
+    )
+
+    assert len(lineups) == 10
+    assert all(locked in set(lineup.lineup["Player"]) for lineup in lineups)
+    exposure = portfolio_exposure(lineups).set_index("Player")["Lineups"]
+    assert exposure.drop(locked).max() <= 4
+
+
+def test_team_cap_does_not_drop_a_locked_players_team():
+    players = make_synthetic_slate("dk", 240, seed=1)
+    locked = players.loc[~players["Ineligible"]].sort_values("FP")["Player"].iloc[0]
+    settings = PortfolioSettings(num_lineups=10, max_exposure=0.4, max_team_exposure=0.5)
+
+    lineups = build_portfolio(players, site="dk", settings=settings, selected_players=[locked], max_workers=1)
+
+    assert len(lineups) == 10
+    assert all(locked in set(lineup.lineup["Player"]) for lineup in lineups)
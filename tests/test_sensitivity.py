@@ -0,0 +1,37 @@
+import pytest
+
+from lineup_optimizer import SolverConfig, available_solver_backends, build_lineup
+from sensitivity import lineup_sensitivity
+from solver_benchmark import make_synthetic_slate
+
+
+@pytest.mark.parametrize("backend", available_solver_backends())
+def test_thresholds_match_locked_and_excluded_solves(backend):
+    players = make_synthetic_slate("dk", 40, seed=3)
+    report = lineup_sensitivity(players, site="dk", solver_config=SolverConfig(backend=backend), max_workers=1)
+    base_points = build_lineup(players, site="dk").solve_stats.objective
+
+    rostered = report[report["Rostered"]]
+    assert len(rostered) == 8
+    for row in rostered.itertuples():
+        excluded = build_lineup(players, site="dk", excluded_players=[row.Player]).solve_stats.objective
+        assert row.FPToExit == pytest.approx(base_points - excluded, abs=0.01)
+
+    for row in report[~report["Rostered"]].head(5).itertuples():
+        locked = build_lineup(players, site="dk", selected_players=[row.Player]).solve_stats.objective
+        assert row.FPToEnter == pytest.approx(base_points - locked, abs=0.01)
+        assert row.TargetFP == pytest.approx(row.FP + row.FPToEnter, abs=0.01)
+
+
+def test_raising_a_bench_player_by_the_threshold_puts_them_in():
+    players = make_synthetic_slate("dk", 40, seed=3)
+    report = lineup_sensitivity(players, site="dk", max_workers=1)
+    bench = report[~report["Rostered"] & report["FPToEnter"].notna()].iloc[0]
+
+    boosted = players.copy()
+    boosted.loc[boosted["Player"] == bench["Player"], "FP"] += bench["FPToEnter"] + 0.05
+    assert bench["Player"] in set(build_lineup(boosted, site="dk").lineup["Player"])
+
+    lowered = players.copy()
+    lowered.loc[lowered["Player"] == bench["Player"], "FP"] += max(bench["FPToEnter"] - 0.05, 0.0)
+    assert bench["Player"] not in set(build_lineup(lowered, site="dk").lineup["Player"])
@@ -1,91 +1,359 @@
 import argparse
 import sys
 
-from selenium import webdriver
-
 from data_providers import (
+    DVP_ENSEMBLE_SOURCES,
+    DVP_SOURCE_TIMEOUT,
     find_first_yahoo_contest,
+    fetch_blended_fantasypros_averages,
     get_dvp_by_position,
-    get_recent_player_stats,
+    headless_chrome,
     import_contest_data,
+    join_contest_data,
+    remember_player_positions,
+    validate_dvp_sources,
 )
-from dfs_core import ContestData, formalize_name
-from lineup_optimizer import build_lineup, calculate_fantasy_points
+from dfs_core import ContestData, cache_path, formalize_name
+from lineup_cache import cached_build_lineup, default_lineup_cache
+from lineup_optimizer import LINEUP_FORMULATIONS, SOLVER_BACKENDS, SolverConfig, build_lineup, calculate_fantasy_points
+from load_team_data import get_team_context
+from pipeline import LineupPipeline
+from portfolio import PortfolioSettings, build_portfolio, portfolio_exposure, portfolio_upload_frame
+from scenarios import compare_scenarios, load_scenarios, run_scenarios
+from sensitivity import lineup_sensitivity
+from slate_snapshot import load_snapshot, save_snapshot
+
+
+def _comma_list(value_type, name: str):
+    def parse(text: str) -> list:
+        try:
+            values = [value_type(value) for value in str(text).split(",")]
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"expected a comma list of {name}, got {text!r}") from None
+        if any(value <= 0 for value in values):
+            raise argparse.ArgumentTypeError(f"expected positive {name}, got {text!r}")
+        return values
+
+    return parse
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Yahoo & DraftKings NBA DFS Optimizer")
     parser.add_argument("--site", choices=["yahoo", "dk"], default="yahoo", help="Select DFS site")
     parser.add_argument("--csv", type=str, default="DKSalaries.csv", help="DraftKings salary CSV path")
+    parser.add_argument(
+        "--dk-fetch",
+        action="store_true",
+        help="Download the DraftKings salary CSV to --csv before the run",
+    )
+    parser.add_argument("--dk-draft-group", type=int, default=None, help="DraftKings draft group id for --dk-fetch")
     parser.add_argument(
         "--dvp-source",
-        choices=["hashtag", "basketballmonster", "none"],
+        choices=["hashtag", "basketballmonster", "local", "ensemble", "none"],
         default="hashtag",
         help="Choose the DVP provider",
     )
-    parser.add_argument("--days", type=int, default=15, help="Number of recent days to use for player stats")
+    parser.add_argument(
+        "--dvp-sources",
+        type=str,
+        default=",".join(DVP_ENSEMBLE_SOURCES),
+        help="Comma list of DVP providers averaged by --dvp-source ensemble",
+    )
+    parser.add_argument(
+        "--dvp-timeout",
+        type=float,
+        default=DVP_SOURCE_TIMEOUT,
+        help="Seconds each --dvp-source ensemble provider may take before it is skipped",
+    )
+    parser.add_argument(
+        "--game-logs",
+        type=str,
+        default="nba_season_game_stats.csv",
+        help="season_data game log file used by --dvp-source local",
+    )
+    parser.add_argument(
+        "--dvp-window",
+        type=int,
+        default=None,
+        help="Trailing days of game logs used by --dvp-source local, defaults to all",
+    )
+    parser.add_argument(
+        "--team-context",
+        action="store_true",
+        help="Adjust projections for game pace and opponent-allowed stats",
+    )
+    parser.add_argument("--season", type=str, default="NBA_2025", help="Basketball Reference season for team context")
+    parser.add_argument(
+        "--days",
+        type=_comma_list(int, "days"),
+        default=[15],
+        help="Recent days of player stats, or a comma list like 7,15,30 to blend several windows",
+    )
+    parser.add_argument("--weights", type=_comma_list(float, "weights"), default=None, help="Comma list of blend weights, one per --days window")
     parser.add_argument("--exclude", nargs="*", default=[], help="Player names to exclude")
     parser.add_argument("--select", nargs="*", default=[], help="Player names to lock into the lineup")
+    parser.add_argument("--solver", choices=sorted(SOLVER_BACKENDS), default="cbc", help="MIP solver backend")
+    parser.add_argument("--time-limit", type=float, default=None, help="Solver time limit in seconds")
+    parser.add_argument("--threads", type=int, default=None, help="Solver thread count")
+    parser.add_argument("--gap", type=float, default=None, help="Relative MIP gap at which the solver stops")
+    parser.add_argument(
+        "--formulation",
+        choices=LINEUP_FORMULATIONS,
+        default=None,
+        help="Lineup model, one variable per player and slot or one per player; default slot, player for --sensitivity",
+    )
+    parser.add_argument("--save-snapshot", type=str, default=None, help="Write the slate inputs to a snapshot file")
+    parser.add_argument(
+        "--from-snapshot",
+        type=str,
+        default=None,
+        help="Load the slate inputs from a snapshot file instead of the network",
+    )
+    parser.add_argument("--lineup-cache", action="store_true", help="Reuse lineups solved earlier for identical inputs")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Keep pipeline state between runs and reproject only players whose inputs changed",
+    )
+    parser.add_argument(
+        "--sensitivity",
+        action="store_true",
+        help="Report the FP change each player needs to enter or leave the optimal lineup",
+    )
+    parser.add_argument("--portfolio", type=int, default=None, help="Build this many lineups for multi-entry contests")
+    parser.add_argument("--max-exposure", type=float, default=1.0, help="Maximum share of lineups per player")
+    parser.add_argument(
+        "--max-team-exposure",
+        type=float,
+        default=1.0,
+        help="Maximum share of lineups rostering any player from one team",
+    )
+    parser.add_argument("--min-unique", type=int, default=1, help="Minimum players that differ between lineups")
+    parser.add_argument(
+        "--portfolio-output",
+        type=str,
+        default="lineups.csv",
+        help="Upload CSV written by --portfolio",
+    )
+    parser.add_argument("--scenarios", type=str, default=None, help="YAML or JSON file of lock/exclude scenarios")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for parallel solves")
     args = parser.parse_args()
+    try:
+        dvp_sources = validate_dvp_sources(args.dvp_sources.split(","))
+    except ValueError as exc:
+        parser.error(str(exc))
+    if args.weights is not None and len(args.weights) != len(args.days):
+        parser.error(f"--weights needs one weight per --days window ({len(args.days)}), got {len(args.weights)}")
+    solver_config = SolverConfig(backend=args.solver, time_limit=args.time_limit, threads=args.threads, gap=args.gap)
+    sensitivity_formulation = args.formulation or "player"
+    args.formulation = args.formulation or "slot"
     excluded_players = [formalize_name(name) for name in args.exclude]
     selected_players = [formalize_name(name) for name in args.select]
 
-    contest_id = None
-    if args.site == "yahoo":
+    if args.from_snapshot:
         try:
-            contest_id = find_first_yahoo_contest()
+            snapshot = load_snapshot(args.from_snapshot)
         except Exception as exc:
-            print(f"Error finding Yahoo contest: {exc}")
+            print(f"Could not load snapshot: {exc}")
             return 1
 
-        if not contest_id:
-            print("No Yahoo contest found.")
+        contest_data = snapshot.contest_data
+        dvp_data = snapshot.dvp_data
+        recent_stats = player_stats = snapshot.player_stats
+        args.site = contest_data.site
+        if "days" in snapshot.meta:
+            args.days = _comma_list(int, "days")(snapshot.meta["days"])
+        args.season = snapshot.meta.get("season", args.season)
+        team_context = snapshot.team_context if args.team_context else None
+        if args.team_context and team_context is None:
+            print("Snapshot has no team context; save it with --team-context to replay it.")
             return 1
+    else:
+        contest_id = None
+        if args.site == "yahoo":
+            try:
+                contest_id = find_first_yahoo_contest()
+            except Exception as exc:
+                print(f"Error finding Yahoo contest: {exc}")
+                return 1
 
-    contest_data = ContestData(site=args.site, contest_id=contest_id, csv=args.csv)
+            if not contest_id:
+                print("No Yahoo contest found.")
+                return 1
 
+        contest_data = ContestData(site=args.site, contest_id=contest_id, csv=args.csv)
+
+    days_label = ",".join(str(days) for days in args.days)
     try:
-        import_contest_data(contest_data)
-        for name in excluded_players:
-            contest_data.inactive_players[name] = 1
+        if not args.from_snapshot:
+            if args.site == "dk" and args.dk_fetch:
+                from draftkings import DraftKingsClient
 
-        driver = None
-        if args.dvp_source == "basketballmonster":
-            options = webdriver.ChromeOptions()
-            options.add_argument("--headless")
-            driver = webdriver.Chrome(options=options)
+                DraftKingsClient().download_salaries(args.csv, draft_group_id=args.dk_draft_group)
+            import_contest_data(contest_data)
 
-        try:
-            dvp_data = get_dvp_by_position(args.dvp_source, driver=driver)
-        finally:
-            if driver is not None:
-                driver.quit()
+            driver = headless_chrome() if args.dvp_source == "basketballmonster" else None
+
+            player_positions = None
+            if args.dvp_source == "local" or (args.dvp_source == "ensemble" and "local" in dvp_sources):
+                player_positions = remember_player_positions(contest_data)
+
+            try:
+                dvp_data = get_dvp_by_position(
+                    args.dvp_source,
+                    driver=driver,
+                    game_logs_path=args.game_logs,
+                    player_positions=player_positions,
+                    window_days=args.dvp_window,
+                    sources=dvp_sources,
+                    timeout=args.dvp_timeout,
+                )
+            finally:
+                if driver is not None:
+                    driver.quit()
+
+            recent_stats = fetch_blended_fantasypros_averages(args.days, weights=args.weights)
+            team_context = get_team_context(args.season) if args.team_context else None
+
+        pipeline = None
+        if args.incremental:
+            # The pipeline's stats stage does the only contest join, and reruns it only when the
+            # FantasyPros stats or the contest data changed. Snapshot stats are already joined.
+            pipeline_path = cache_path("pipeline", f"{args.site}.pkl")
+            pipeline = LineupPipeline.load(pipeline_path, site=args.site)
+            pipeline.update(
+                contest_data=contest_data,
+                player_stats=recent_stats,
+                stats_joined=bool(args.from_snapshot),
+            )
+            player_stats = pipeline.player_stats()
+        elif not args.from_snapshot:
+            player_stats = join_contest_data(recent_stats, contest_data)
+
+        if args.save_snapshot and not args.from_snapshot:
+            save_snapshot(
+                args.save_snapshot,
+                contest_data,
+                player_stats,
+                dvp_data,
+                team_context=team_context,
+                days=days_label,
+                dvp_source=args.dvp_source,
+                season=args.season,
+            )
+            print(f"Saved slate snapshot to {args.save_snapshot}")
 
-        player_stats = get_recent_player_stats(contest_data, days=args.days)
         if player_stats.empty:
             print("No player stats available.")
             return 1
 
-        projected_players = calculate_fantasy_points(
-            player_stats,
-            dvp_data=dvp_data,
-            apply_dvp=args.dvp_source != "none",
-        )
-        lineup_result = build_lineup(
-            projected_players,
-            site=args.site,
-            lineup_name=f"Last {args.days} Days",
-            selected_players=selected_players,
-            excluded_players=excluded_players,
-        )
+        apply_dvp = args.dvp_source != "none" and bool(dvp_data)
+        if pipeline is not None:
+            pipeline.update(
+                dvp_data=dvp_data,
+                team_context=team_context,
+                apply_dvp=apply_dvp,
+            )
+            projected_players = pipeline.projections()
+            pipeline.save(pipeline_path)
+            print(f"Reprojected {pipeline.last_run['projections']} of {len(projected_players)} players.")
+        else:
+            projected_players = calculate_fantasy_points(
+                player_stats,
+                dvp_data=dvp_data,
+                apply_dvp=apply_dvp,
+                team_context=team_context,
+            )
+
+        if args.scenarios:
+            scenario_results = run_scenarios(
+                projected_players,
+                load_scenarios(args.scenarios),
+                site=args.site,
+                selected_players=selected_players,
+                excluded_players=excluded_players,
+                solver_config=solver_config,
+                formulation=args.formulation,
+                max_workers=args.workers,
+            )
+            print(f"Scenario lineups built using Last {days_label} Days stats:")
+            print(compare_scenarios(scenario_results, site=args.site).to_string())
+            for name, result in scenario_results.items():
+                if isinstance(result, Exception):
+                    print(f"{name}: {result}")
+            return 0
+
+        if args.portfolio:
+            settings = PortfolioSettings(
+                num_lineups=args.portfolio,
+                max_exposure=args.max_exposure,
+                max_team_exposure=args.max_team_exposure,
+                min_unique=args.min_unique,
+            )
+            lineups = build_portfolio(
+                projected_players,
+                site=args.site,
+                settings=settings,
+                selected_players=selected_players,
+                excluded_players=excluded_players,
+                solver_config=solver_config,
+                formulation=args.formulation,
+                max_workers=args.workers,
+            )
+            upload = portfolio_upload_frame(lineups, projected_players, site=args.site)
+            upload.to_csv(args.portfolio_output, index=False)
+            print(f"Built {len(lineups)} of {args.portfolio} lineups, saved to {args.portfolio_output}")
+            print(portfolio_exposure(lineups).head(20).to_string(index=False))
+            return 0
+
+        if pipeline is not None:
+            lineup_result = pipeline.lineup(
+                selected_players=selected_players,
+                excluded_players=excluded_players,
+                solver_config=solver_config,
+                formulation=args.formulation,
+            )
+            pipeline.save(pipeline_path)
+        else:
+            solve_lineup = cached_build_lineup if args.lineup_cache else build_lineup
+            lineup_result = solve_lineup(
+                projected_players,
+                site=args.site,
+                lineup_name=f"Last {days_label} Days",
+                selected_players=selected_players,
+                excluded_players=excluded_players,
+                solver_config=solver_config,
+                formulation=args.formulation,
+            )
     except Exception as exc:
         print(f"Optimizer failed: {exc}")
         return 1
 
-    print(f"Lineup built using Last {args.days} Days stats:")
+    print(f"Lineup built using Last {days_label} Days stats:")
     print(lineup_result.lineup)
     print(f"Total Salary Used: {lineup_result.total_salary}")
     print(f"Projected Fantasy Points: {lineup_result.projected_points}")
+    if (args.lineup_cache and default_lineup_cache().hits) or (pipeline and pipeline.last_run.get("lineup_cached")):
+        print("Lineup served from the lineup cache.")
+    stats = lineup_result.solve_stats
+    print(
+        f"Solver: {stats.backend} ({stats.solution_status}) in {stats.solve_seconds}s, "
+        f"{stats.variables} variables, {stats.constraints} constraints"
+    )
+
+    if args.sensitivity:
+        report = lineup_sensitivity(
+            projected_players,
+            site=args.site,
+            selected_players=selected_players,
+            excluded_players=excluded_players,
+            solver_config=solver_config,
+            formulation=sensitivity_formulation,
+            base_result=lineup_result,
+            max_workers=args.workers,
+        )
+        print("FP change needed to enter or leave the optimal lineup:")
+        print(report.to_string(index=False))
     return 0
 
 